@@ -27,6 +27,7 @@ Board maintains the Sudoku board.
 
 # dependencies:
 import   csv
+from     array   import array
 from     copy    import copy, deepcopy
 
 
@@ -46,6 +47,65 @@ assert dim > 0, 'dim must be positive'
 assert DIM > 0, 'DIM must be positive'
 assert dim * dim == DIM, 'DIM must be dim * dim'
 
+# all numbers that may be placed on the board
+ALL_DIGITS = frozenset(range(1, DIM+1))
+
+# the numbers 1..DIM in ascending order. They are also the
+# row and column indices, so hot loops iterate over this 
+# tuple instead of creating a new range each time
+NUMBERS = tuple(range(1, DIM+1))
+
+# UNITS[idx] contains (row, column, quadrant) of the cell with
+# index idx = (i-1) * DIM + (j-1), all of them counting from 0.
+# Quadrants are numbered row by row
+UNITS = tuple((idx // DIM, idx % DIM, (idx // DIM // dim) * dim + (idx % DIM) // dim) for idx in range(DIM*DIM))
+
+# the cells (i,j) of each row, column, and quadrant: 
+# ROWS[i-1], COLUMNS[j-1], QUADRANTS[d1-1][d2-1]
+ROWS      = tuple(tuple((i, j) for j in range(1, DIM+1)) for i in range(1, DIM+1))
+COLUMNS   = tuple(tuple((i, j) for i in range(1, DIM+1)) for j in range(1, DIM+1))
+QUADRANTS = tuple(tuple(tuple(((d1-1) * dim + r, (d2-1) * dim + c) for r in range(1, dim+1) for c in range(1, dim+1)) 
+                        for d2 in range(1, dim+1)) for d1 in range(1, dim+1))
+
+# QUADRANT_OF_CELL[idx] contains (d1, d2, iq, jq) of the cell with 
+# index idx: its quadrant (d1,d2) and its position (iq,jq) within
+# the quadrant, all of them counting from 1 (see inverseMapQuadrant)
+QUADRANT_OF_CELL = tuple((row // dim + 1, col // dim + 1, row % dim + 1, col % dim + 1) 
+                         for (row, col, quadrant) in UNITS)
+
+# BAND_BOUNDS[d-1] = (low, high) contains the first and the last
+# row (or column) belonging to quadrant row (or column) d
+BAND_BOUNDS = tuple(((d-1) * dim + 1, d * dim) for d in range(1, dim+1))
+
+
+# several strategies represent sets of numbers (or of rows
+# and columns) as bitmasks where bit n-1 stands for n.
+# ALL_NUMBERS_MASK has the bits of all numbers 1..DIM set
+ALL_NUMBERS_MASK = (1 << DIM) - 1
+
+# NUMBERS_OF_MASK[mask] contains the numbers whose bits are set
+# in mask. It is computed once for all 2**DIM masks, so that 
+# decoding a bitmask is a single lookup
+NUMBERS_OF_MASK = tuple(tuple(num for num in NUMBERS if mask & (1 << (num-1))) 
+                        for mask in range(0, ALL_NUMBERS_MASK + 1))
+
+# numbersInMask turns such a bitmask into a list of numbers.
+# Bits beyond DIM are ignored
+def numbersInMask(mask):
+    return list(NUMBERS_OF_MASK[mask & ALL_NUMBERS_MASK])
+
+# maskOfNumbers is the inverse of numbersInMask
+def maskOfNumbers(numbers):
+    mask = 0
+    for num in numbers:
+        mask |= 1 << (num-1)
+    return mask
+
+# candidatesOfMask returns the candidates left by an influencer
+# mask. The tuple is taken from NUMBERS_OF_MASK
+def candidatesOfMask(mask):
+    return NUMBERS_OF_MASK[~mask & ALL_NUMBERS_MASK]
+
 
         
 # coordinates in SudokuSolver as seen by the caller
@@ -79,23 +139,98 @@ assert dim * dim == DIM, 'DIM must be dim * dim'
 # analysis of  internal behavior.
 
 class Board:
-    # self._data is an one-dimensional array that
-    # stores all information for the Sudoku board. 
-    # It consists of tuples (x, y, z)
-    # x = True => position occupied by number y 
-    # x = False=> position influenced by other numbers 
-    #             defined in z without being occupied
-    
+    # The board stores all information for the Sudoku board
+    # in three parallel one-dimensional arrays with DIM*DIM
+    # entries each (instead of a list of (x, y, z)-tuples):
+    # occupied[idx] = 1 => position occupied by number value[idx]
+    # occupied[idx] = 0 => position influenced by the numbers
+    #                      whose bits are set in mask[idx]
+    #                      (bit n-1 set <=> n is an influencer)
+    # getElement() still provides the (x, y, z) view of a cell
+    # with z being the list of influencers.
     
-    # call self.reinitialize() to delete _data[] and
-    # initialize it with new values
-    # and register required (predefined) strategies
+    # instances only carry the attributes listed here
+    __slots__ = ('occupied', 'value', 'mask', 'vacancyCount', 'monitoringActive', 'version', 
+                 'rowStamps', 'columnStamps', 'quadrantStamps', '_links', 'solution', 'candidateLines')
     
-    def __init__(self, data):
-        self._data = data
+    # data is an optional list of (x, y, z)-tuples the
+    # board is initialized with
+    def __init__(self, data = None):
+        self.occupied = bytearray(DIM*DIM)
+        self.value    = bytearray(DIM*DIM)
+        self.mask     = array('H', bytes(2*DIM*DIM))
+        # number of vacant cells, kept up to date by setElementAt()
+        self.vacancyCount = DIM*DIM
+        self.monitoringActive = False
+        # change tracking: each modification of a cell increments
+        # version and stamps the row, column and quadrant of the
+        # cell with it. Strategies compare these stamps with the
+        # version they have seen last to skip unchanged regions
+        self.version        = 0
+        self.rowStamps      = [0] * DIM
+        self.columnStamps   = [0] * DIM
+        self.quadrantStamps = [0] * DIM
+        # (version, rows, columns) computed by getCandidateLines()
+        self.candidateLines = None
+        if data != None:
+            self._data = data
         # self._links manages strong, weak and inner
         # links for strategies that use chaining
         self._links = None 
+        # brute force solution used by Cheating
+        self.solution = ""
+        
+    # _data is the list of (x, y, z)-tuples of all cells.
+    # It is built on demand and only meant for copying
+    # or persisting the state of a board. Assigning a list 
+    # of (x, y, z)-tuples replaces the content of the board
+    @property
+    def _data(self):
+        return [self.elementAt(idx) for idx in range(0, DIM*DIM)]
+        
+    @_data.setter
+    def _data(self, data):
+        for idx in range(0, DIM*DIM):
+            self.setElementAt(idx, data[idx])
+        
+    # record that the cell with internal index idx has changed
+    def markChanged(self, idx):
+        self.version += 1
+        row = idx // DIM
+        col = idx % DIM
+        self.rowStamps[row] = self.version
+        self.columnStamps[col] = self.version
+        self.quadrantStamps[(row // dim) * dim + col // dim] = self.version
+        
+    # record that all cells with the internal indices in indices
+    # have changed. A batch of changes counts as one version
+    def markCellsChanged(self, indices):
+        self.version += 1
+        version = self.version
+        for idx in indices:
+            (row, col, quadrant) = UNITS[idx]
+            self.rowStamps[row] = version
+            self.columnStamps[col] = version
+            self.quadrantStamps[quadrant] = version
+        
+    # snapshot() returns a copy of the content of the board
+    # that restore() accepts later on 
+    def snapshot(self):
+        return (bytes(self.occupied), bytes(self.value), array('H', self.mask))
+        
+    # restore() overwrites the board in place with a snapshot. 
+    # Objects holding a reference to the board such as 
+    # strategies remain valid. All regions count as changed
+    def restore(self, state):
+        (occupied, value, mask) = state
+        self.occupied[:] = occupied
+        self.vacancyCount = self.occupied.count(0)
+        self.value[:]    = value
+        self.mask[:]     = array('H', mask)
+        self.version += 1
+        self.rowStamps[:]      = [self.version] * DIM
+        self.columnStamps[:]   = [self.version] * DIM
+        self.quadrantStamps[:] = [self.version] * DIM
         
     # create weak, strong and inner links    
     def createLinks(self):
@@ -136,11 +271,8 @@ class Board:
     # take board coordinate (i, j) and map it to 
     # quadrant-relative coordinate
     def inverseMapQuadrant(self, i, j):
-        d1 = (i-1) // dim + 1
-        d2 = (j-1) // dim + 1
-        iq = i - (d1-1) * dim
-        jq = j - (d2-1) * dim
-        return (d1, d2, iq, jq)
+        # precomputed for all cells, see QUADRANT_OF_CELL
+        return QUADRANT_OF_CELL[(i - 1) * DIM + j - 1]
         
     # map quadrant-relative coordinate to board-coordinate
     def inverseMap(self, d1, d2, r, c):
@@ -151,35 +283,115 @@ class Board:
     # build a wrapper over the low-level access to 
     # elements in _data[]
     
-    # get content of field
+    # build the (x, y, z)-tuple of the cell with internal index idx
+    def elementAt(self, idx):
+        if self.occupied[idx]:
+            return (True, self.value[idx], [])
+        else:
+            return (False, 0, numbersInMask(self.mask[idx]))
+            
+    # store the (x, y, z)-tuple xyz in the cell with internal index idx
+    def setElementAt(self, idx, xyz):
+        (x, y, z) = xyz
+        # count cells turning from vacant to occupied and vice versa
+        self.vacancyCount += self.occupied[idx] - (1 if x else 0)
+        if x:
+            self.occupied[idx] = 1
+            self.value[idx]    = y
+            self.mask[idx]     = 0
+        else:
+            self.occupied[idx] = 0
+            self.value[idx]    = 0
+            self.mask[idx]     = maskOfNumbers(z)
+        self.markChanged(idx)
+    
+    # occupy field (i,j) with number working on the arrays 
+    # directly, i.e. without building (x, y, z)-tuples. Returns
+    # the influencer mask of the field before, which allows to 
+    # undo the occupation with setVacancy()
+    def setOccupant(self, number, i, j):
+        idx = self.map(i,j)
+        previousMask = self.mask[idx]
+        # candidates the field loses by the occupation
+        removed = 0 if self.occupied[idx] else ~previousMask & ALL_NUMBERS_MASK
+        if not self.occupied[idx]: self.vacancyCount -= 1
+        self.occupied[idx] = 1
+        self.value[idx]    = number
+        self.mask[idx]     = 0
+        previousVersion = self.version
+        self.markChanged(idx)
+        self.updateCandidateLines(previousVersion, [(idx, removed)])
+        return previousMask
+        
+    # turn field (i,j) into a vacancy with the influencers
+    # given by the bitmask mask
+    def setVacancy(self, i, j, mask):
+        idx = self.map(i,j)
+        if self.occupied[idx]: self.vacancyCount += 1
+        self.occupied[idx] = 0
+        self.value[idx]    = 0
+        self.mask[idx]     = mask
+        self.markChanged(idx)
+        
+    # get content of field as (x, y, z)-tuple
     def getElement(self, i, j):
-        return self._data[self.map(i,j)]
+        return self.elementAt(self.map(i,j))
         
     # set element of field
     def setElement(self, i, j, xyz): 
-        self._data[self.map(i,j)] = xyz
+        self.setElementAt(self.map(i,j), xyz)
     
     # get content of field in quadrant
     def getElementInQuadrant(self, d1, d2, i, j):
-        return self._data[self.mapQuadrant(d1,d2,i,j)]
+        return self.elementAt(self.mapQuadrant(d1,d2,i,j))
         
     def setElementInQuadrant(self, d1, d2, i, j, xyz):
-        self._data[self.mapQuadrant(d1,d2,i,j)] = xyz
+        self.setElementAt(self.mapQuadrant(d1,d2,i,j), xyz)
+        
+    # get the influencers of field as bitmask 
+    # (bit n-1 set <=> n is an influencer). Occupied
+    # cells have no influencers, i.e. 0 is returned
+    def getMask(self, i, j):
+        return self.mask[self.map(i,j)]
+        
+    def getMaskInQuadrant(self, d1, d2, i, j):
+        return self.mask[self.mapQuadrant(d1,d2,i,j)]
+        
+    # get the candidates of field as bitmask 
+    # (bit n-1 set <=> n is a candidate). Occupied
+    # cells have no candidates, i.e. 0 is returned
+    def getCandidateMask(self, i, j):
+        idx = self.map(i,j)
+        if self.occupied[idx]:
+            return 0
+        return ~self.mask[idx] & ALL_NUMBERS_MASK
+        
+    # candidate bitmasks of all cells (i,j) in cells. The board
+    # arrays are read directly, i.e. without a method call or 
+    # an (x, y, z)-tuple per cell
+    def getCandidateMasks(self, cells):
+        occupied = self.occupied # bound once for the loop
+        mask     = self.mask
+        masks    = []
+        for (i,j) in cells:
+            idx = (i - 1) * DIM + j - 1 # see map()
+            masks.append(0 if occupied[idx] else ~mask[idx] & ALL_NUMBERS_MASK)
+        return masks
         
     # get a row of the board 
     def getRow(self, row):
         result = []
         for col in range(1, DIM+1):
-            (x,y,z) = self.getElement(row, col)
-            result.append((x,y))
+            idx = self.map(row, col)
+            result.append((bool(self.occupied[idx]), self.value[idx]))
         return result
         
     # get a column of the board
     def getColumn(self, col):
         result = []
         for row in range(1, DIM + 1):
-            (x,y,z) = self.getElement(row, col)
-            result.append((x,y))
+            idx = self.map(row, col)
+            result.append((bool(self.occupied[idx]), self.value[idx]))
         return result
         
     # get a quadrant of the board
@@ -187,8 +399,8 @@ class Board:
         resultlist = []
         for row in range(1, dim+1):
             for col in range (1, dim+1):
-                cell = self.getElementInQuadrant(d1, d2, row, col) 
-                resultlist.append((cell[0], cell[1]))
+                idx = self.mapQuadrant(d1, d2, row, col)
+                resultlist.append((bool(self.occupied[idx]), self.value[idx]))
         return resultlist
         
     # get the whole region that (i,j) can "see"
@@ -228,81 +440,124 @@ class Board:
         vacancies=[]
         for row in range(1,DIM+1):
             for col in range(1, DIM+1):
-                (x,y,z) = self.getElement(row,col)
-                if not x:
+                if not self.occupied[self.map(row,col)]:
                     vacancies.append((row, col))
         return vacancies
     
     # get vacant neighbor cells in quadrant defined by (i,j)        
     def getVacanciesInQuadrant(self, d1, d2, r, c):
         vacancies =    []
+        # bound once for the loop
+        occupied    = self.occupied
+        mapQuadrant = self.mapQuadrant
         for row in range(1,dim+1):
             for col in range(1, dim+1):
                 if (row, col) == (r, c): continue
-                (x, y, z) = self.getElementInQuadrant(d1,d2, row, col)
-                if x: continue
+                if occupied[mapQuadrant(d1,d2, row, col)]: continue
                 else: vacancies.append((row, col))
         return vacancies
                 
     # get vacant neighbor cells in row i
     def getVacanciesInRow(self, i, j):
         vacancies =   []
+        occupied = self.occupied # bound once for the loop
         for col in range(1, DIM+1):
             if col == j: continue
-            (x, y, z) = self.getElement(i, col)
-            if x: continue
+            if occupied[(i-1) * DIM + col - 1]: continue # see map()
             else: vacancies.append((i,col))
         return vacancies
         
     # get vacant neighbor cells in column j
     def getVacanciesInColumn(self, i, j):
         vacancies =   []
+        occupied = self.occupied # bound once for the loop
         for row in range(1, DIM+1):
             if row == i: continue
-            (x, y, z) = self.getElement(row, j)
-            if x: continue
+            if occupied[(row-1) * DIM + j - 1]: continue # see map()
             else: vacancies.append((row, j))
         return vacancies
         
     # return number in cell(i,j) if available,
     # otherwise return 0
     def getOccupant(self, i, j):
-        (x, y, z) = self.getElement(i,j)
-        if x: 
-            return y
-        else: 
-            return 0
+        # vacant cells always store 0 as value
+        return self.value[self.map(i,j)]
             
     # which other numbers already dominate this position?
     # => these numbers are no candidates for this field        
     def getInfluencers(self, i, j):
-        (x, y, z) = self.getElement(i,j)
-        if not x:
-            return z
-        else: 
-            return []
+        # occupied cells have an empty mask
+        return numbersInMask(self.mask[self.map(i,j)])
        
-    # get potential candidates for this location
+    # get potential candidates for this location.
+    # The candidates only depend on the influencer mask, so 
+    # they are taken from the cache of candidatesOfMask, which
+    # never needs to be invalidated when the board changes. 
+    # Callers get their own list they may change
     def getCandidates(self, i, j):
-        (x,y,z) = self.getElement(i,j)
-        if x: # occupied locations neither have 
-              # influencers nor candidates
+        idx = self.map(i,j)
+        if self.occupied[idx]: # occupied locations neither have 
+                               # influencers nor candidates
             return []
         else:
-            infl = self.getInfluencers(i,j)
-            candidates = []
-            for num in range (1, DIM+1):
-                if not num in infl:
-                    candidates.append(num)
-            return candidates
+            return list(candidatesOfMask(self.mask[idx]))
+            
+    # walk the board once and record for every number num
+    # - in which columns of row i num is a candidate: rows[num][i]
+    # - in which rows of column j num is a candidate: columns[num][j]
+    # both are bitmasks with bit k-1 representing column (or row) k.
+    # columns is just the transposed view of rows, so both are 
+    # filled in the same traversal. Indices start with 1.
+    # The result is cached, so X-Wing and Swordfish share it.
+    # Removed candidates are patched into the cache (see 
+    # updateCandidateLines), other changes of the board cause
+    # a rebuild. Callers must not change the lines
+    def getCandidateLines(self):
+        if self.candidateLines != None and self.candidateLines[0] == self.version:
+            return self.candidateLines[1:]
+        rows    = [[0] * (DIM+1) for num in range(DIM+1)]
+        columns = [[0] * (DIM+1) for num in range(DIM+1)]
+        occupied = self.occupied
+        mask     = self.mask
+        for idx in range(0, DIM*DIM):
+            if occupied[idx]: continue # occupied cell
+            (row, col, quadrant) = UNITS[idx] # counting from 0
+            rowBit = 1 << row
+            colBit = 1 << col
+            for num in candidatesOfMask(mask[idx]): # cached per mask
+                rows[num][row+1]    |= colBit
+                columns[num][col+1] |= rowBit
+        self.candidateLines = (self.version, rows, columns)
+        return (rows, columns)
+            
+    # the candidate lines cached by getCandidateLines() are kept
+    # up to date when cells lose candidates, so that they need 
+    # not be rebuilt after each change. removals is a list of
+    # (idx, removed) with removed being the bitmask of the 
+    # candidates the cell with internal index idx has lost. The
+    # cache is only updated if it was valid for previousVersion, 
+    # the version of the board before these changes. The lines 
+    # of a number are replaced instead of changed in place, as 
+    # strategies keep the lines seen by their previous run
+    def updateCandidateLines(self, previousVersion, removals):
+        if self.candidateLines == None or self.candidateLines[0] != previousVersion:
+            return # no valid cache, it is rebuilt on demand
+        (version, rows, columns) = self.candidateLines
+        replaced = set() # numbers whose lines have been replaced
+        for (idx, removed) in removals:
+            (row, col, quadrant) = UNITS[idx] # counting from 0
+            for num in NUMBERS_OF_MASK[removed]:
+                if not num in replaced:
+                    rows[num]    = rows[num][:]
+                    columns[num] = columns[num][:]
+                    replaced.add(num)
+                rows[num][row+1]    &= ~(1 << col)
+                columns[num][col+1] &= ~(1 << row)
+        self.candidateLines = (self.version, rows, columns)
             
     # calculate candidates from currently known influencers
     def calcCandidates(self, z):
-        candidates = []
-        for num in range (1,DIM+1):
-            if not num in z:
-                candidates.append(num)
-        return candidates       
+        return list(candidatesOfMask(maskOfNumbers(z)))
         
     ############# same row, column, box ########### 
     
@@ -351,7 +606,7 @@ class Board:
     # and checks whether cand is a candidate of cell
     def cellContainsCandidate(self, cell, cand):
         row,col = cell
-        return cand in self.getCandidates(row,col)
+        return bool(self.getCandidateMask(row,col) & (1 << (cand-1)))
         
     # check in an array of cells ( = (row,col) ) 
     # whether all cells contain cand as candidate
@@ -439,23 +694,41 @@ class Board:
     # add additional influencer to single cell(i,j). Note: 
     # occupied cells are left untouched
     def addInfluencer(self, number, i, j):
-        (x, y, z) = self.getElement(i,j)
-        if not x: # location is not occupied 
-            if not (number in z): # if not already in list
-                z.append(number) # add it to list
+        self.addInfluencersBulk(1 << (number-1), [(i,j)])
+                    
+    # add all numbers whose bits are set in numbersMask as 
+    # influencers to each cell (i,j) in cells in one sweep.
+    # Occupied cells are left untouched. Returns True if an
+    # influencer was added to at least one cell
+    def addInfluencersBulk(self, numbersMask, cells):
+        occupied = self.occupied # bound once for the loop
+        mask     = self.mask
+        changed  = [] # (internal index, new influencers) of changed cells
+        for (i,j) in cells:
+            idx = (i - 1) * DIM + j - 1 # see map()
+            if occupied[idx]: continue # location is occupied
+            added = numbersMask & ~mask[idx] # new influencers only
+            if added:
+                mask[idx] |= added
+                changed.append((idx, added))
                 if self.monitoringActive:
-                    self.setElement(i,j,(x, y, z))
-                    print("addInfluencer called for (" + str(i) + "," + str(j) + ") adding " + str(number))
+                    for number in numbersInMask(added):
+                        print("addInfluencer called for (" + str(i) + "," + str(j) + ") adding " + str(number))
+        # the whole batch is recorded at once
+        if changed: 
+            previousVersion = self.version
+            self.markCellsChanged([idx for (idx, added) in changed])
+            # new influencers are candidates removed
+            self.updateCandidateLines(previousVersion, changed)
+        return len(changed) > 0
            
     # add influence to quadrant
     def addInfluencerToQuadrant(self, number, d1, d2, exceptionList = []):
         quad_row = (d1-1) * dim
         quad_col = (d2-1) * dim
-        
-        for i in range(1, dim+1):
-            for j in range(1, dim+1):
-                if (i,j) not in exceptionList:
-                    self.addInfluencer(number, quad_row+i, quad_col+j)
+        cells = [(quad_row+i, quad_col+j) for i in range(1, dim+1) for j in range(1, dim+1) 
+                 if (i,j) not in exceptionList]
+        self.addInfluencersBulk(1 << (number-1), cells)
                    
     # add influences of number in (i,j) without any exceptions
     # however, occupied cells are left untouched                
@@ -468,20 +741,14 @@ class Board:
     # add number as influencer to column j with the exceptions stated 
     # by the exceptionList
     def addInfluencerToColumn(self, number, j, exceptionList = []):
-        for i in range(1, DIM+1):
-            if not (i in exceptionList):
-                (x,y,z) = self.getElement(i,j)
-                if not x:
-                    self.addInfluencer(number, i, j)
+        cells = [(i,j) for i in NUMBERS if not (i in exceptionList)]
+        self.addInfluencersBulk(1 << (number-1), cells)
 
     # add number as influencer to row i with the exceptions stated 
     # by the exceptionList
     def addInfluencerToRow(self, number, i, exceptionList = []):
-        for j in range(1, DIM+1):
-            if not (j in exceptionList):
-                (x,y,z) = self.getElement(i,j)
-                if not x:
-                    self.addInfluencer(number, i, j)
+        cells = [(i,j) for j in NUMBERS if not (j in exceptionList)]
+        self.addInfluencersBulk(1 << (number-1), cells)
     
     # add influencers to region but do not change (i,j):                
     def addInfluencerToRegionExclusive(self, number, i, j):
@@ -497,8 +764,8 @@ class Board:
     def checkConformanceInRow(self, r):
         numberList = []
         for c in range(1,DIM+1):
-            (x,y,z) = self.getElement(r,c)
-            if x:
+            y = self.value[self.map(r,c)]
+            if y:
                 if y in numberList:
                     print("Conflict: " + str(y) + " found twice in row " + str(r))
                     return False
@@ -513,8 +780,8 @@ class Board:
     def checkConformanceInColumn(self, c):
         numberList = []
         for r in range(1,DIM+1):
-            (x,y,z) = self.getElement(r,c)
-            if x:
+            y = self.value[self.map(r,c)]
+            if y:
                 if y in numberList:
                     print("Conflict: " + str(y) + " found twice in column " + str(c))
                     return False
@@ -533,8 +800,8 @@ class Board:
     
         for i in range(0, dim):
             for j in range(0, dim):
-                (x,y,z) = self.getElement(quadTop + i, quadLeft + j)
-                if x:
+                y = self.value[self.map(quadTop + i, quadLeft + j)]
+                if y:
                     if y in numberList:
                         print("Conflict: " + str(y) + " found twice in quadrant (" + str(d1) + "," + str(d2) + ")")
                         return False
@@ -568,14 +835,8 @@ class Board:
                         
     # create string list from the current board
     def turnBoardIntoString(self):
-        sl = ""
-        for idx in range(0, DIM*DIM):
-            (x,y,z) = self._data[idx]
-            if x:
-                sl += str(y)
-            else:
-                sl += str(0)
-        return sl
+        # vacant cells store 0 as value
+        return "".join([str(y) for y in self.value])
             
     ############# file I/O methods #############   
           
@@ -583,14 +844,8 @@ class Board:
     # operation does only work if board is conformant to rules
     def turnBoardIntoList(self):
         if self.checkConformanceOfBoard():
-            rows=[]
-            for i in range(0, DIM*DIM):
-                (x,y,z) = self._data[i]
-                if x:
-                    rows.append(y)
-                else:
-                    rows.append(0)
-            return rows
+            # vacant cells store 0 as value
+            return list(self.value)
         else:
             return []
         
@@ -641,8 +896,10 @@ class Board:
     # . 
     # 0; 3; 1; 0; 0; 4; 7; 0; 0
     # => DIM rows with DIM elements per row
+    # Existing files are never overwritten: opening the file
+    # raises FileExistsError in this case
     def writeSudokuToCSV(self, filename, rows):
-        with open(filename, 'w', newline='') as csvfile:
+        with open(filename, 'x', newline='') as csvfile:
             writer = csv.writer(csvfile, delimiter=';',quoting=csv.QUOTE_NONE)
             # cut rows in pieces 
             print("... writing file " + filename + "...")
@@ -661,16 +918,15 @@ class Board:
     # create list of all possible numbers between
     # 1 and DIM
     def fullListOfNumbers():
-        return [num for num in range(1, DIM+1)]
+        return list(NUMBERS)
         
         
     # find first vacancy using internal _data[]
     # structure
     def findFirstVacancy(self):
-        for idx in range(0, DIM*DIM):
-            (x,y,z) = self._data[idx]
-            if not x:
-                return self.inverseMapInternal(idx)
+        idx = self.occupied.find(0)
+        if idx != -1:
+            return self.inverseMapInternal(idx)
         return (0,0)
         
 """
@@ -778,19 +1034,6 @@ class Links:
         # List of strong links within a cell
         self.innerLinks = [[] for num in range(1, DIM+1)]
         
-    # helper method that expects the candidate num and a list 
-    # of cells, and figures out all cells in which num is a 
-    # candidate
-    def findCandidateInCells(self, num, cells):
-        cellsWithCandidate = []
-        for (i,j) in cells: # iterate all cells 
-            # is num a candidate in this cell?
-            if num in self.board.getCandidates(i, j):
-                # yes, then store it in list
-                cellsWithCandidate.append((i,j))
-        # return list of cells with num as candidate
-        return cellsWithCandidate
-        
     # these 3 funktions should be visible externally
     # the num is mapped with self.map to num-1 and then
     # the list is returned. Thus a user does not need 
@@ -810,10 +1053,13 @@ class Links:
     # cells contains all the cells to analyze
     def enterLinks(self, cells):
         # iterate through all numbers/candidates
-        for num in range(0, DIM+1):
+        # candidate bitmasks of all cells, read in a single pass
+        masks = self.board.getCandidateMasks(cells)
+        for num in range(1, DIM+1):
             # find all cells in these cells that contain num 
             # as candidate
-            cellsWithCandidate = self.findCandidateInCells(num, cells)
+            bit = 1 << (num-1)
+            cellsWithCandidate = [cells[idx] for idx in range(0, len(cells)) if masks[idx] & bit]
             # if there are only two cells in the row, column, or quadrant, 
             # we have found a strong link wrt. num
             if len(cellsWithCandidate) == 2:
@@ -881,21 +1127,18 @@ class Links:
     # search all rows for links    
     def searchRowsForLinks(self):
         for row in range(1, DIM+1):
-            cells = self.board.getRow(row)
-            self.enterLinks(cells)
+            self.enterLinks(ROWS[row-1])
         
     # search all columns for links
     def searchColumnsForLinks(self):
         for col in range(1, DIM+1):
-            cells = self.board.getColumn(col)
-            self.enterLinks(cells)
+            self.enterLinks(COLUMNS[col-1])
         
     # search all quadrants for links
     def searchQuadrantsForLinks(self):
         for d1 in range(1, dim+1):
             for d2 in range(1, dim+1):
-                cells = self.board.getQuadrant(d1,d2)
-                self.enterLinks(cells)
+                self.enterLinks(QUADRANTS[d1-1][d2-1])
                 
     # initial method             
     def provideAllLinks(self):
@@ -32,8 +32,10 @@ from board import Board
 from strategy import OccupationStrategy
 
 class Cheating(OccupationStrategy): 
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
+        super().__init__(board)
             
     def applyToQuadrant(self, i, j):
         pass
@@ -45,8 +47,7 @@ class Cheating(OccupationStrategy):
         pass
             
     def applyStrategy(self, i, j):
-        (x,y,z) = self.board.getElement(i,j)
-        if not x:
+        if not self.board.getOccupant(i,j):
             # calculating index 
             idx = self.board.map(i,j)
             # looking up solution in brute force table:
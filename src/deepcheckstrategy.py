@@ -31,62 +31,43 @@ number that should occupy (i,j)
     
 from board import Board, DIM, dim
 from strategy import OccupationStrategy
+
+
+# kernel of DeepCheckStrategy working on plain bitmasks:
+# candidatesMask contains the candidates of the analyzed cell,
+# masks the influencers of all other vacant cells of the row, 
+# column or quadrant. Returns the smallest candidate that is 
+# an influencer of all these cells or 0 if there is none
+def deepCheck(candidatesMask, masks):
+    common = candidatesMask
+    for mask in masks:
+        common &= mask
+        if not common: return 0
+    # number of the lowest bit set
+    return (common & -common).bit_length()
         
     
 class DeepCheckStrategy(OccupationStrategy): 
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
+        super().__init__(board)
+        
+    # common part of applyToQuadrant/Column/Row: vacancies
+    # are the other vacant cells (row, col) of the region of (i,j)
+    def applyToVacancies(self, i, j, vacancies):
+        getMask = self.board.getMask # bound once for the loop
+        masks = [getMask(row, col) for (row, col) in vacancies]
+        return deepCheck(self.board.getCandidateMask(i,j), masks)
         
     def applyToQuadrant(self, i, j):
         (d1,d2,r,c) = self.board.inverseMapQuadrant(i,j)
-        candidates  = self.board.getCandidates(i,j)
-        vacancies   = self.board.getVacanciesInQuadrant(d1,d2,r,c)
-        result = 0
-        for num in candidates:
-            counter = 0
-            for vacancy in vacancies:
-                row = vacancy[0]
-                col = vacancy[1]
-                (x,y,z) = self.board.getElementInQuadrant(d1, d2, row, col)
-                if not num in z: break
-                else: counter+=1
-            if counter == len(vacancies): 
-                result = num
-                break
-        return result
+        inverseMap  = self.board.inverseMap # bound once for the loop
+        vacancies   = [inverseMap(d1,d2,row,col) for (row,col) in self.board.getVacanciesInQuadrant(d1,d2,r,c)]
+        return self.applyToVacancies(i, j, vacancies)
             
     def applyToColumn(self, i,j):
-        candidates  = self.board.getCandidates(i,j)
-        vacancies = self.board.getVacanciesInColumn(i,j)
-        result = 0
-        for num in candidates:
-            counter = 0
-            for vacancy in vacancies:
-                row = vacancy[0]
-                col = vacancy[1]
-                (x,y,z) = self.board.getElement(row, col)
-                if not num in z: break
-                else: 
-                    counter+=1
-            if counter == len(vacancies): 
-                result = num
-                break
-        return result
+        return self.applyToVacancies(i, j, self.board.getVacanciesInColumn(i,j))
             
     def applyToRow(self, i, j):
-        candidates  = self.board.getCandidates(i,j)
-        vacancies = self.board.getVacanciesInRow(i,j)
-        result = 0
-        for num in candidates:
-            counter = 0
-            for vacancy in vacancies:
-                row = vacancy[0]
-                col = vacancy[1]
-                (x,y,z) = self.board.getElement(row, col)
-                if not num in z: break
-                else: counter+=1
-            if counter == len(vacancies): 
-                result = num
-                break
-        return result
-            
\ No newline at end of file
+        return self.applyToVacancies(i, j, self.board.getVacanciesInRow(i,j))
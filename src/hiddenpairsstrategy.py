@@ -22,97 +22,81 @@ This package consist of the classes
 ############ HiddenPairsStrategy ############ 
 
 
-from board import Board, DIM, dim
+from board import Board, DIM, ROWS, COLUMNS, QUADRANTS, numbersInMask
 from strategy import InfluenceStrategy
 
 class HiddenPairsStrategy(InfluenceStrategy):
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
+        super().__init__(board)
     
+    # only rows, columns and quadrants that changed since
+    # the previous run are analyzed
     def applyStrategy(self):
+        if not self.startRun(): return # board did not change
         self.applyStrategyToQuadrants()
         self.applyStrategyToRows()
         self.applyStrategyToColumns()
         
-    def handleHiddenPairs(self, cells, nums):
+    # cells is the list of DIM cells (i,j) of a row, column or 
+    # quadrant, masks holds their candidate bitmasks (bit n-1 
+    # stands for candidate n). A single pass records for each 
+    # number the cells where it is a candidate (bit idx stands 
+    # for cells[idx]). (n1,n2) is a hidden pair if both numbers 
+    # are candidates in exactly the same two cells. Then all 
+    # other candidates of these cells can be removed
+    def handleHiddenPairs(self, cells, masks):
         assert len(cells) == DIM, "Error: array must have " + str(DIM) + " cells"
-        cand = []
-        occurrences = []
-        n1,n2 = nums
-        # go through all cells in the array
+        positions = [0] * (DIM+1)
+        present   = 0 # all candidates of the array
         for idx in range(0, DIM):
-            # if the combination (n1,n2) is part of the cell
-            i,j = cells[idx]
-            cand = self.board.getCandidates(i,j)
-            if (n1 in cand) and (n2 in cand):
-                # append the cell to occurrences
-                occurrences.append(cells[idx])
-        # if the combination does not appear in exactly 2 cells
-        if len(occurrences) != 2:
-            return  # => return to caller
-        else:
-            # take both occurrences
-            cell1 = occurrences[0]
-            cell2 = occurrences[1]
-            # get the candidate-list for these two cells
-            c1i, c1j = cell1
-            c2i, c2j = cell2
-            cand1 = self.board.getCandidates(c1i, c1j)
-            cand2 = self.board.getCandidates(c2i, c2j)
-            # if lengths are greater than 2 we can continue
-            if (len(cand1) > 2) and (len(cand2) > 2):
-                # iterate through all possible numbers
-                for num in range(1, DIM+1):
-                    # if num is different from n1,n2
-                    # it can be a candidate in the hidden pair
-                    if (num != n1) and (num != n2):
-                        
-                        # => add it as an influencer
-                        if not num in cand1:
-                            self.board.addInfluencer(num, cell1[0], cell1[1])
-                        if not num in cand2:
-                            self.board.addInfluencer(num, cell2[0], cell2[1])
+            present |= masks[idx]
+            for num in numbersInMask(masks[idx]):
+                positions[num] |= 1 << idx
+        # only numbers that are candidates in exactly 2 cells qualify
+        pairs = [num for num in numbersInMask(present) if positions[num].bit_count() == 2]
+        for k in range(0, len(pairs)-1):
+            n1 = pairs[k]
+            p1 = positions[n1]
+            # positions may have changed by a previous elimination
+            if p1.bit_count() != 2: continue
+            for n2 in pairs[k+1:]:
+                if positions[n2] != p1: continue
+                pair = (1 << (n1-1)) | (1 << (n2-1))
+                for idx in range(0, DIM):
+                    if not (p1 & (1 << idx)): continue
+                    # all other candidates are turned into influencers
+                    other = masks[idx] & ~pair
+                    if other:
+                        self.board.addInfluencersBulk(other, [cells[idx]])
+                        for num in numbersInMask(other):
+                            positions[num] &= ~(1 << idx)
+                        masks[idx] &= pair
                            
     def applyStrategyToColumns(self):
-        # iterate over all columns
-        for j in range(1, DIM+1):
-            array = []
-            # get all rows and append (i,j) to array
-            for i in range(1, DIM+1):
-                array.append((i,j))
-                # for all number combinations (n1,n2)
-            for n1 in range(1, DIM):
-                for n2 in range(n1+1, DIM+1):
-                    # search for hidden pairs
-                    self.handleHiddenPairs(array, (n1,n2))
+        # iterate over all changed columns
+        for j in self.changedColumns():
+            array = COLUMNS[j-1]
+            # candidate bitmasks of all cells, computed once
+            masks = self.board.getCandidateMasks(array)
+            # search the array once for all combinations
+            self.handleHiddenPairs(array, masks)
                             
     def applyStrategyToRows(self):
-        # iterate over all rows:
-         for i in range(1, DIM+1):
-            array = []
-            # get all columns and append(i,j) to array
-            for j in range(1, DIM+1):
-                array.append((i,j))
-            # for all number combinations (n1,n2)
-            for n1 in range(1, DIM):
-                for n2 in range(n1+1, DIM+1):
-                    # search for hidden pairs
-                    self.handleHiddenPairs(array, (n1,n2))
+        # iterate over all changed rows
+        for i in self.changedRows():
+            array = ROWS[i-1]
+            # candidate bitmasks of all cells, computed once
+            masks = self.board.getCandidateMasks(array)
+            # search the array once for all combinations
+            self.handleHiddenPairs(array, masks)
                     
     def applyStrategyToQuadrants(self):
-        # for all quadrants (d1,d2):
-        for d1 in range(1, dim+1):
-            for d2 in range(1, dim+1):
-                array = []
-                # iterate through all cells in the quadrant
-                for r in range(1, dim+1):
-                    for c in range(1, dim+1):
-                        # and append the cells to array
-                        array.append(((d1-1) * dim + r, (d2-1) * dim + c))
-                # check all number combinations (n1, n2)
-                for n1 in range(1, DIM):
-                    for n2 in range(n1+1, DIM+1):
-                        # search for hidden pairs
-                        self.handleHiddenPairs(array, (n1,n2))
-                
-            
\ No newline at end of file
+        # for all changed quadrants (d1,d2):
+        for (d1, d2) in self.changedQuadrants():
+            array = QUADRANTS[d1-1][d2-1]
+            # candidate bitmasks of all cells, computed once
+            masks = self.board.getCandidateMasks(array)
+            # search the array once for all combinations
+            self.handleHiddenPairs(array, masks)
@@ -21,102 +21,91 @@ This package consist of the classes
 """
 ############ HiddenTriples Strategy ############ 
 
-from board import Board, DIM, dim
+from board import Board, DIM, ROWS, COLUMNS, QUADRANTS, numbersInMask, maskOfNumbers
 from strategy import InfluenceStrategy
 
+# kernel of HiddenTriplesStrategy working on plain bitmasks:
+# positions[num] is the bitmask of the cells of a row, column or
+# quadrant where num is a candidate, present the bitmask of all 
+# candidates found there. (n1,n2,n3) is a hidden triple if the 
+# three numbers are candidates in exactly three cells altogether.
+# Returns a list of (triple, cellsMask) with triple being the 
+# bitmask of (n1,n2,n3) and cellsMask the bitmask of the cells
+def hiddenTriples(positions, present):
+    result = []
+    # only numbers appearing in 1 to 3 cells can be part of a triple
+    nums = [num for num in numbersInMask(present) if positions[num].bit_count() <= 3]
+    for a in range(0, len(nums)-2):
+        for b in range(a+1, len(nums)-1):
+            p12 = positions[nums[a]] | positions[nums[b]]
+            if p12.bit_count() > 3: continue
+            for c in range(b+1, len(nums)):
+                p123 = p12 | positions[nums[c]]
+                if p123.bit_count() == 3:
+                    result.append((maskOfNumbers((nums[a], nums[b], nums[c])), p123))
+    return result
+    
+
 class HiddenTriplesStrategy(InfluenceStrategy):
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
+        super().__init__(board)
     
+    # only rows, columns and quadrants that changed since
+    # the previous run are analyzed
     def applyStrategy(self):
+        if not self.startRun(): return # board did not change
         self.applyStrategyToQuadrants()
         self.applyStrategyToRows()
         self.applyStrategyToColumns()
         
-    def handleHiddenTriples(self, cells, nums):
+    # cells is the list of DIM cells (i,j) of a row, column or 
+    # quadrant, masks holds their candidate bitmasks (bit n-1 
+    # stands for candidate n). A single pass records for each 
+    # number the cells where it is a candidate (bit idx stands 
+    # for cells[idx]). For each hidden triple found by the 
+    # kernel, all other candidates of its cells can be removed
+    def handleHiddenTriples(self, cells, masks):
         assert len(cells) == DIM, "Error: array must have " + str(DIM) + " cells"
-        cand = []
-        occurrences = []
-        n1,n2,n3 = nums
-        # go through all cells in the array
+        positions = [0] * (DIM+1)
+        present   = 0 # all candidates of the array
         for idx in range(0, DIM):
-            # if the combination (n1,n2) is part of the cell
-            i,j = cells[idx]
-            cand = self.board.getCandidates(i,j)
-            if (n1 in cand) and (n2 in cand) and (n3 in cand):
-                # append the cell to occurrences
-                occurrences.append(cells[idx])
-        # if the combination does not appear in exactly 2 cells
-        if len(occurrences) != 3:
-            return  # => return to caller
-        else:
-            # take the 3 occurrences
-            cell1 = occurrences[0]
-            cell2 = occurrences[1]
-            cell3 = occurrences[2]
-            # get the candidate-list for these two cells
-            c1i, c1j = cell1
-            c2i, c2j = cell2
-            c3i, c3j = cell3
-            cand1 = self.board.getCandidates(c1i, c1j)
-            cand2 = self.board.getCandidates(c2i, c2j)
-            cand3 = self.board.getCandidates(c3i, c3j)
-            # if lengths are greater than 2 we can continue
-            if (len(cand1) > 3) and (len(cand2) > 3) and (len(cand3) > 3):
-                # iterate through all possible numbers
-                for num in range(1, DIM+1):
-                    # if num is different from n1,n2
-                    # it can be a candidate in the hidden pair
-                    if (num != n1) and (num != n2) and (num != n3):
-                        # => add it as an influencer
-                        if not num in cand1:
-                            self.board.addInfluencer(num, c1i, c1j)
-                        if not num in cand2:
-                            self.board.addInfluencer(num, c2i, c2j)
-                        if not num in cand3:
-                            self.board.addInfluencer(num, c3i, c3j)
+            present |= masks[idx]
+            for num in numbersInMask(masks[idx]):
+                positions[num] |= 1 << idx
+        for (triple, cellsMask) in hiddenTriples(positions, present):
+            for idx in range(0, DIM):
+                if not (cellsMask & (1 << idx)): continue
+                # all other candidates are turned into influencers
+                other = masks[idx] & ~triple
+                if other:
+                    self.board.addInfluencersBulk(other, [cells[idx]])
+                    masks[idx] &= triple
                            
     def applyStrategyToColumns(self):
-        # iterate over all columns
-        for j in range(1, DIM+1):
-            array = []
-            # get all rows and append (i,j) to array
-            for i in range(1, DIM+1):
-                array.append((i,j))
-                # for all number combinations (n1,n2)
-            for n1 in range(1, DIM-1):
-                for n2 in range(n1+1, DIM):
-                    for n3 in range(n2+1, DIM+1):
-                        # search for hidden triples
-                        self.handleHiddenTriples(array, (n1,n2,n3))
+        # iterate over all changed columns
+        for j in self.changedColumns():
+            array = COLUMNS[j-1]
+            # candidate bitmasks of all cells, computed once
+            masks = self.board.getCandidateMasks(array)
+            # search the array once for all combinations
+            self.handleHiddenTriples(array, masks)
                             
     def applyStrategyToRows(self):
-        # iterate over all rows:
-         for i in range(1, DIM+1):
-            array = []
-            # get all columns and append(i,j) to array
-            for j in range(1, DIM+1):
-                array.append((i,j))
-            # for all number combinations (n1,n2)
-            for n1 in range(1, DIM-1):
-                for n2 in range(n1+1, DIM):
-                    for n3 in range(n2+1, DIM+1):
-                        # search for hidden pairs
-                        self.handleHiddenTriples(array, (n1,n2,n3))
+        # iterate over all changed rows
+        for i in self.changedRows():
+            array = ROWS[i-1]
+            # candidate bitmasks of all cells, computed once
+            masks = self.board.getCandidateMasks(array)
+            # search the array once for all combinations
+            self.handleHiddenTriples(array, masks)
                     
     def applyStrategyToQuadrants(self):
-        # for all quadrants (d1,d2):
-        for d1 in range(1, dim+1):
-            for d2 in range(1, dim+1):
-                array = []
-                # iterate through all cells in the quadrant
-                for r in range(1, dim+1):
-                    for c in range(1, dim+1):
-                        # and append the cells to array
-                        array.append(((d1-1) * dim + r, (d2-1) * dim + c))
-                # check all number combinations (n1, n2)
-                for n1 in range(1, DIM-1):
-                    for n2 in range(n1+1, DIM):
-                        for n3 in range(n2+1, DIM+1):
-                            # search for hidden triples
-                            self.handleHiddenTriples(array, (n1,n2,n3))   
\ No newline at end of file
+        # for all changed quadrants (d1,d2):
+        for (d1, d2) in self.changedQuadrants():
+            array = QUADRANTS[d1-1][d2-1]
+            # candidate bitmasks of all cells, computed once
+            masks = self.board.getCandidateMasks(array)
+            # search the array once for all combinations
+            self.handleHiddenTriples(array, masks)
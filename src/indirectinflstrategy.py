@@ -53,49 +53,54 @@ This package consist of the classes
 # This strategy may substiture other strategies such as 
 # HiddenPairs, PointingPairsAndTriples, ....
             
-from board import Board, DIM, dim
+from board import Board, DIM, dim, BAND_BOUNDS
 from strategy import InfluenceStrategy
 
 class IndirectInfluencersStrategy(InfluenceStrategy):
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
-    # check row of quadrant for indirect influencers      
+        super().__init__(board)
+    # check row of quadrant for indirect influencers. The 
+    # candidates of the vacant cells are collected as a bitmask
+    # (bit n-1 stands for candidate n)
     def analyzeRowInQuadrant(self,d1,d2, r):
-        totalSet = set()
+        candidates = 0
         countVacantCells = 0
-        for c in range (1, dim+1):
-            (x,y,z) = self.board.getElementInQuadrant(d1,d2,r,c)
-            if x: continue # occupied cell
+        row = (d1-1)*dim + r
+        (low, high) = BAND_BOUNDS[d2-1]
+        # bound once for the loop
+        occupied = self.board.occupied
+        getCandidateMask = self.board.getCandidateMask
+        for j in range(low, high+1):
+            if occupied[(row-1) * DIM + j - 1]: continue # occupied cell, see map()
             else: 
                 countVacantCells += 1
-                candidates = self.board.calcCandidates(z)
-                totalSet=totalSet.union(set(candidates))
-        if len(totalSet) == countVacantCells:
-            for num in totalSet:
-                row = (d1-1)*dim + r
-                for j in range(1,DIM+1):
-                    (x,y,z) = self.board.getElement(row,j)
-                    if not x and not (j in range((d2-1)*dim + 1, (d2-1)*dim + dim + 1)):
-                        self.board.addInfluencer(num, row, j)
+                candidates |= getCandidateMask(row, j)
+        if candidates.bit_count() == countVacantCells:
+            # all cells of the row outside the quadrant
+            cells = [(row, j) for j in range(1,DIM+1) if not (low <= j <= high)]
+            self.board.addInfluencersBulk(candidates, cells)
     
-    # check column of quadrant for indirect influencers                    
+    # check column of quadrant for indirect influencers. The 
+    # candidates of the vacant cells are collected as a bitmask                    
     def analyzeColumnInQuadrant(self, d1, d2, c):
-        totalSet = set()
+        candidates = 0
         countVacantCells = 0
-        for r in range (1, dim+1):
-            (x,y,z) = self.board.getElementInQuadrant(d1,d2,r,c)
-            if x: continue # occupied cell
+        col = (d2-1)*dim + c
+        (low, high) = BAND_BOUNDS[d1-1]
+        # bound once for the loop
+        occupied = self.board.occupied
+        getCandidateMask = self.board.getCandidateMask
+        for i in range(low, high+1):
+            if occupied[(i-1) * DIM + col - 1]: continue # occupied cell, see map()
             else: 
                 countVacantCells += 1
-                candidates = self.board.calcCandidates(z)
-                totalSet=totalSet.union(set(candidates))
-        if len(totalSet) == countVacantCells:
-            for num in totalSet:
-                col = (d2-1)*dim + c
-                for i in range(1,DIM+1):
-                    (x,y,z) = self.board.getElement(i, col)
-                    if not x and not (i in range((d1-1)*dim + 1, (d1-1)*dim + dim + 1)):
-                        self.board.addInfluencer(num, i, col)
+                candidates |= getCandidateMask(i, col)
+        if candidates.bit_count() == countVacantCells:
+            # all cells of the column outside the quadrant
+            cells = [(i, col) for i in range(1,DIM+1) if not (low <= i <= high)]
+            self.board.addInfluencersBulk(candidates, cells)
       
     
     # iterates through all rows and columns of a quadrant
@@ -105,8 +110,9 @@ class IndirectInfluencersStrategy(InfluenceStrategy):
         for c in range(1, dim+1):
             self.analyzeColumnInQuadrant(d1,d2,c)
     
-    # iterates through all quadrants
+    # iterates through all quadrants that changed 
+    # since the previous run
     def applyStrategy(self):
-        for d1 in range(1, dim+1):
-            for d2 in range(1,dim+1):
-                self.addIndirectInfluencersToQuadrant(d1,d2)
\ No newline at end of file
+        if not self.startRun(): return # board did not change
+        for (d1, d2) in self.changedQuadrants():
+            self.addIndirectInfluencersToQuadrant(d1,d2)
\ No newline at end of file
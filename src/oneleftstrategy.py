@@ -28,8 +28,10 @@ from board import Board, dim, DIM
 from strategy import OccupationStrategy
     
 class OneCandidateLeftStrategy(OccupationStrategy): 
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
+        super().__init__(board)
         
     def applyToQuadrant(self, i, j):
         pass
@@ -41,8 +43,8 @@ class OneCandidateLeftStrategy(OccupationStrategy):
         pass
     def applyStrategy(self, i, j):
         result = 0
-        (x,y,z) = self.board.getElement(i,j)
-        if len(z) == DIM-1:  # exactly one number is missing 
+        mask = self.board.getMask(i,j) # influencers of (i,j)
+        if mask.bit_count() == DIM-1:  # exactly one number is missing 
                               # in the influencer list which 
                               # needs to be the one to be put 
                               # in (i,j)
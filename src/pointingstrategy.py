@@ -32,74 +32,64 @@ class of SudokuSolver.
 """
 
 from strategy import InfluenceStrategy
-from board import Board, DIM, dim
+from board import Board, DIM, dim, NUMBERS, QUADRANTS, BAND_BOUNDS, numbersInMask
+
+# the cells of a quadrant are numbered row by row from 0 to DIM-1
+# (see QUADRANTS). LOCAL_ROWS[r] is the bitmask of the cells in 
+# row r of a quadrant, LOCAL_COLUMNS[c] the one of column c
+LOCAL_ROWS    = tuple(((1 << dim) - 1) << (r * dim) for r in range(0, dim))
+LOCAL_COLUMNS = tuple(sum(1 << (r * dim + c) for r in range(0, dim)) for c in range(0, dim))
 
 class PointingPairsAndTriplesStrategy(InfluenceStrategy):
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
+        super().__init__(board)
         
+    # only quadrants that changed since the 
+    # previous run are analyzed
     def applyStrategy(self):
+        if not self.startRun(): return # board did not change
         self.applyStrategyToQuadrants()
         
+    # a single pass over the cells of a quadrant records for each
+    # number the cells where it is a candidate (bit idx stands 
+    # for QUADRANTS[d1-1][d2-1][idx]). Eliminations only affect
+    # cells outside the quadrant, so the positions stay valid
     def applyStrategyToQuadrants(self):
-        for num in range(1, DIM+1):
-            for d1 in range (1, dim+1):
-                for d2 in range(1,dim+1):
-                    cells = self.board.getQuadrant(d1,d2)
-                    self.handlePointingPairsAndTriples(cells, num)
+        for (d1, d2) in self.changedQuadrants():
+            positions = [0] * (DIM+1)
+            masks = self.board.getCandidateMasks(QUADRANTS[d1-1][d2-1])
+            for idx in range(0, DIM):
+                for num in numbersInMask(masks[idx]):
+                    positions[num] |= 1 << idx
+            for num in NUMBERS:
+                self.handlePointingPairsAndTriples(d1, d2, num, positions[num])
         
-    def handlePointingPairsAndTriples(self, cells, num):
-        assert len(cells) == DIM, "Error: array must have " + str(DIM) + " cells"
-        cand = []
-        occurrences = []
-        # go through all cells in the array
-        for idx in range(0, DIM):
-            # if n is part of the cell
-            i,j = cells[idx]
-            cand = self.board.getCandidates(i,j)
-            if num in cand:
-                # append the cell to occurrences
-                occurrences.append(cells[idx])
+    # positions is the bitmask of the cells of quadrant (d1,d2)
+    # where num is a candidate. If these are 2 or 3 cells 
+    # within a single row (or column) of the quadrant, num is 
+    # removed from the rest of this row (or column)
+    def handlePointingPairsAndTriples(self, d1, d2, num, positions):
         # if the number does not appear in  2 or 3 cells
-        count = len(occurrences)
-        if not count in range(2, 3+1):
+        if not positions.bit_count() in range(2, dim+1):
             return
+        for r in range(0, dim):
+            if not (positions & ~LOCAL_ROWS[r]):
+                # columns of the source quadrant are skipped
+                (low, high) = BAND_BOUNDS[d2-1]
+                row = (d1-1) * dim + r + 1
+                cells = [(row, c) for c in NUMBERS if not (low <= c <= high)]
+                break
         else:
-            inSameRow = True 
-            inSameCol = True
-            c1i = 0
-            c1j = 0
-            c2i = 0
-            c2j = 0
-            c3i = 0
-            c3j = 0
-                
-            if count == 2:
-                cell1 = occurrences[0]
-                cell2 = occurrences[1]
-                c1i, c1j = cell1
-                c2i, c2j = cell2
-                inSameRow = inSameRow and (c1i == c2i)
-                inSameCol = inSameCol and (c1j == c2j)
-                    
-            if count == 3:
-                cell3 = occurrences[2]
-                c3i, c3j = cell3
-                inSameRow = inSameRow and (c2i == c3i)
-                inSameCol = inSameCol and (c2j == c3j)
-            
-            (d1,d2,r,c) = self.board.inverseMapQuadrant(c1i, c1j)
-            if inSameRow:
-                low  = (d2-1)*dim + 1
-                high = (d2-1)*dim + 3
-                row = c1i
-                for c in range(1, DIM+1):
-                    if c >= low or c <= high: continue
-                    self.board.addInfluencer(num, row, c)
-            elif inSameCol:
-                low  = (d1-1)*dim + 1
-                high = (d1-1)*dim + 3
-                col = c1j
-                for r in range(1, DIM+1):
-                    if r >= low or r <= high: continue
-                    self.board.addInfluencer(num, r, col)
\ No newline at end of file
+            for c in range(0, dim):
+                if not (positions & ~LOCAL_COLUMNS[c]):
+                    # rows of the source quadrant are skipped
+                    (low, high) = BAND_BOUNDS[d1-1]
+                    col = (d2-1) * dim + c + 1
+                    cells = [(r, col) for r in NUMBERS if not (low <= r <= high)]
+                    break
+            else:
+                return
+        # all cells get num as influencer in one batch
+        self.board.addInfluencersBulk(1 << (num-1), cells)
@@ -31,45 +31,39 @@ should be put into (i,j)
 ######### RemainingInfluencerStrategy #########           
 
 
-from board import Board, DIM, dim
+from board import Board, DIM, dim, ALL_DIGITS, numbersInMask
 from strategy import OccupationStrategy
 
 class RemainingInfluencerStrategy(OccupationStrategy): 
+    __slots__ = ()
+    
     def __init__(self, board):
-        self.board = board
+        super().__init__(board)
         
-    def applyToQuadrant(self, i, j):
-        candidates = self.board.getCandidates(i,j)
-        (d1, d2, r, c) = self.board.inverseMapQuadrant(i,j)
-        vacancies  = self.board.getVacanciesInQuadrant(d1,d2,r,c)
-        totalSet = {1,2,3,4,5,6,7,8,9}
-        for vacancy in vacancies:
-            (x,y,z) =             self.board.getElementInQuadrant(d1,d2,vacancy[0],vacancy[1])
-            totalset = totalSet.intersection(set(z))
+    # common part of applyToQuadrant/Column/Row: vacancies
+    # are the other vacant cells (row, col) of the region of (i,j)
+    def applyToVacancies(self, i, j, vacancies):
+        totalSet = set(ALL_DIGITS)
+        getMask = self.board.getMask # bound once for the loop
+        for (row, col) in vacancies:
+            mask = getMask(row, col)
+            totalSet = totalSet.intersection(set(numbersInMask(mask)))
+        # numbers already placed in the region influence all
+        # vacant cells, but they are no candidates of (i,j)
+        totalSet = totalSet.intersection(set(self.board.getCandidates(i,j)))
         if len(totalSet) == 1:
-            return totalSet[0]           
+            return totalSet.pop()
         else:
             return 0
+        
+    def applyToQuadrant(self, i, j):
+        (d1, d2, r, c) = self.board.inverseMapQuadrant(i,j)
+        inverseMap = self.board.inverseMap # bound once for the loop
+        vacancies  = [inverseMap(d1,d2,row,col) for (row,col) in self.board.getVacanciesInQuadrant(d1,d2,r,c)]
+        return self.applyToVacancies(i, j, vacancies)
                 
     def applyToColumn(self, i,j):
-        vacancies  = self.board.getVacanciesInColumn(i,j)
-        totalSet = {1,2,3,4,5,6,7,8,9}
-        for vacancy in vacancies:
-            (x,y,z) = self.board.getElement(vacancy[0],vacancy[1])
-            totalset = totalSet.intersection(set(z))
-        if len(totalSet) == 1:
-            return totalSet[0]           
-        else:
-            return 0
+        return self.applyToVacancies(i, j, self.board.getVacanciesInColumn(i,j))
                 
     def applyToRow(self, i, j):
-        vacancies  = self.board.getVacanciesInRow(i,j)
-        totalSet = {1,2,3,4,5,6,7,8,9}
-        for vacancy in vacancies:
-            (x,y,z) = self.board.getElement(vacancy[0],vacancy[1])
-            totalset = totalSet.intersection(set(z))
-        if len(totalSet) == 1:
-            return totalSet[0]           
-        else:
-            return 0
-                 
\ No newline at end of file
+        return self.applyToVacancies(i, j, self.board.getVacanciesInRow(i,j))
@@ -28,18 +28,17 @@ SudokuSolver helps solving Sudoku puzzles.
 
 # dependencies:
 import   csv
+import   sys
 import   time
 from     enum              import Enum, unique
 from     random            import shuffle
-from     copy              import copy, deepcopy
-import   os.path
+from     copy              import copy
 from     memory            import StatePersistence
 from     chains            import Chain
 from     generator         import SudokuGenerator
 from     strategy          import OccupationStrategy, InfluenceStrategy
-from     board             import Board, DIM, dim, Links
+from     board             import Board, DIM, dim, Links, UNITS, ALL_NUMBERS_MASK, numbersInMask, candidatesOfMask
 from pointingstrategy      import PointingPairsAndTriplesStrategy
-from remainingstrategy     import RemainingInfluencerStrategy
 from deepcheckstrategy     import DeepCheckStrategy
 from oneleftstrategy       import OneCandidateLeftStrategy
 from indirectinflstrategy  import IndirectInfluencersStrategy
@@ -68,6 +67,13 @@ assert dim > 0, 'dim must be positive'
 assert DIM > 0, 'DIM must be positive'
 assert dim * dim == DIM, 'DIM must be dim * dim'
 
+# characters allowed in a string representation of a board 
+DIGIT_CHARS = frozenset("0123456789")
+
+# string representations of the numbers 0 to DIM, computed once 
+# for the display methods
+NUMBER_STRINGS = tuple(str(num) for num in range(0, DIM+1))
+
  
 # specifies constants with unique values that determine
 # display mode of displayXXX()-methods.
@@ -112,15 +118,14 @@ class Info(Enum):
 # analysis of  internal behavior.
 
 class SudokuSolver:
-    # self._data is an one-dimensional array that
-    # stores all information for the Sudoku board. 
-    # It consists of tuples (x, y, z)
+    # self.board stores all information for the Sudoku 
+    # board. Each cell can be viewed as tuple (x, y, z)
     # x = True => position occupied by number y 
     # x = False=> position influenced by other numbers 
     #             defined in z without being occupied
     
     
-    # call self.reinitialize() to delete _data[] and
+    # call self.reinitialize() to delete the board and
     # initialize it with new values
     # and register required (predefined) strategies
     def __init__(self, withCheating, withMonitoring):
@@ -143,8 +148,8 @@ class SudokuSolver:
         self.attachOccupationStrategy(strategy)
         strategy = OneCandidateLeftStrategy(self.board)
         self.attachOccupationStrategy(strategy)
-        strategy = RemainingInfluencerStrategy(self.board)
-        self.attachOccupationStrategy(strategy)
+        # RemainingInfluencerStrategy is not registered: any number
+        # it finds is already found by DeepCheckStrategy
        
         if self.withCheating:
             strategy = Cheating(self.board)
@@ -164,12 +169,31 @@ class SudokuSolver:
         strategy = IndirectInfluencersStrategy(self.board)
         self.attachInfluenceStrategy(strategy)
         
-    # deletes and reinitializes self._data
+        # interactive commands and their handlers, built once
+        # and looked up by solve() after each step
+        self.commands = {
+            "q": self.commandQuit,
+            "p": self.commandPersist,
+            "w": self.commandWrite,
+            "h": self.commandHelp,
+            "a": self.commandActivateMonitoring,
+            "d": self.commandDeactivateMonitoring,
+            "i": self.commandInfluencers,
+            "c": self.commandCandidates,
+            "s": self.commandShuffle,
+            "n": self.commandNoninteractive
+        }
+        # commands available when solve() is stuck
+        self.stuckCommands = {
+            "q": self.commandStuckQuit,
+            "w": self.commandStuckWrite
+        }
+        
+    # deletes and reinitializes self.board
     # Note: registered strategies are left untouched
     def reinitialize(self):
         self.states = {}
-        data = [(False,0,[]) for i in range(0, DIM*DIM)]
-        self.board = Board(data)
+        self.board = Board() # all cells vacant without influencers
         if self.monitoringActive:
             self.board.turnMonitoringOn()
         else:
@@ -227,8 +251,7 @@ class SudokuSolver:
                     
     def canBeOccupied(self, i, j):
         retVal = (0, "")
-        (x, y, z) = self.board.getElement(i,j) # get entry
-        if not x:
+        if not self.board.getOccupant(i,j): # vacant cell
             for strategy in self.occupationStrategies:
                 result = strategy.applyStrategy(i,j)
                 if result != 0: 
@@ -240,25 +263,20 @@ class SudokuSolver:
     # set surpress to True to prevent information about
     # called InfluenceStrategies
     def occupy(self, number, i, j):
-        # get internal data for (i,j)
-        (x, y, z) = self.board.getElement(i,j)
+        occupant = self.board.getOccupant(i,j)
         # check if (i,j) is already occupied
         # this also ensures that no occupation
         # strategy gets an occupied cell passed
-        if x: # is (i,j) already occupied
-            print("Error: Position ("+str(i)+"," + str(j) + ") " + "already occupied by " + str(y))
+        if occupant != 0: # is (i,j) already occupied
+            print("Error: Position ("+str(i)+"," + str(j) + ") " + "already occupied by " + str(occupant))
             return
         else: # cell is vacant
-            (x_old, y_old, z_old) = (x, y, z) # save previous content
-            x = True  # mark cell as occupied
-            y = number # set number which occupies the cell
-            z = [] # clear influencers
-            self.board.setElement(i,j, (x,y,z)) # update _data[]
+            # occupy the cell and save its previous influencers
+            previousMask = self.board.setOccupant(number, i, j)
             if not self.board.checkConformanceOfBoard(): # check for conformance
                 print("Error: rule violation in (" + str(i) + "," + str(j) + ") when entering " + str(number))
                 print("Restoring previous content")
-                (x, y, z) = (x_old, y_old, z_old)
-                self.board.setElement(i,j,(x,y,z))
+                self.board.setVacancy(i, j, previousMask)
             else:
                 # reanalyze the board, as some influencers have been 
                 # introduced by occupying (i,j), so that the occupation
@@ -268,17 +286,33 @@ class SudokuSolver:
                 self.board.addInfluencerToRegionExclusive(number, i, j)
                 # call all strategies which may remove candidates
                 # from some cells which is equivalent to adding
-                # influencers
+                # influencers. Deferred (expensive) strategies are
+                # only used by applyAllInfluenceStrategies()
                 for strategy in self.influenceStrategies:
+                    if strategy.deferred: continue
                     if self.monitoringActive:
                         print("Applying strategy " + type(strategy).__name__)
                     strategy.applyStrategy()
+                    
+    # apply all influence strategies including the deferred ones
+    # until none of them is able to add further influencers.
+    # Returns True if any influencer has been added
+    def applyAllInfluenceStrategies(self):
+        startVersion = self.board.version
+        while True:
+            version = self.board.version
+            for strategy in self.influenceStrategies:
+                if self.monitoringActive:
+                    print("Applying strategy " + type(strategy).__name__)
+                strategy.applyStrategy()
+            if self.board.version == version: # nothing changed
+                break
+        return self.board.version != startVersion
     
     # is position occupied. Other method would be 
     # to check for not ((i,j) in vacancies)        
     def isOccupied(self, i, j):
-        (x, y, z) = self.board.getElement(i,j)
-        return x                       
+        return self.board.getOccupant(i,j) != 0
 
 
 
@@ -292,14 +326,13 @@ class SudokuSolver:
         if len(sl) != DIM * DIM:
             print("Error: wrong length of list: " + str(len(sl)))
             return False
-     
+        if set(sl) <= DIGIT_CHARS:
+            return True
+        # search the invalid char for the error message
         for idx in range(0, DIM*DIM):
-            if sl[idx] in ['0','1','2','3','4','5','6','7','8','9']:
-                continue      
-            else:
-                print("Error: invalid char " + sl[idx] + " at " + str(i))
+            if not sl[idx] in DIGIT_CHARS:
+                print("Error: invalid char " + sl[idx] + " at " + str(idx))
                 return False
-        return True 
     
     # prepare a string list of a Sudoku and let 
     # it be converted to internal board _data[]
@@ -315,13 +348,13 @@ class SudokuSolver:
     # take a one-dimensional list and convert it to Sudoku board 
     # but only if board conforms to Sudoku rules
     def turnListIntoBoard(self, rows):
-        _data = deepcopy(self.board._data)
+        state = self.board.snapshot()
         for i in range(0, DIM*DIM):
             num = rows[i]
             if num != 0:
                 self.occupy(num, i // DIM + 1, i % DIM + 1)
         if not self.board.checkConformanceOfBoard(): # if invalid board
-            self.board = Board(_data)
+            self.board.restore(state)
         self.vacancies = self.board.getVacancies()
     ############# display methods ############# 
              
@@ -332,133 +365,139 @@ class SudokuSolver:
         
     def displayBoard(self, info = Info.ALL, compact = False):
         if info == Info.NONE: return
+        out   = [] # output is collected and written at once
+        write = out.append
         for k in range(1,DIM+1):
             if (info == Info.OCCUPANTS) and (k > 1) and ((k - 1) % 3 == 0): 
-                print("----------------------------------------")
-                print()
+                write("----------------------------------------\n")
+                write("\n")
             for l in range(1,DIM+1):
                 if (info == Info.OCCUPANTS) and (l > 1) and ((l - 1) % 3 == 0): 
-                    print("|", end = " ")
-                (x,y,z) = self.getElement(k,l)
+                    write("| ")
+                (x,y,z) = self.board.getElement(k,l)
                 if x:
                     if info == Info.ALL:
-                        print("[" + str(k) + "," +str(l) + "] y = *" +str(y), end = " ")
+                        write("[" + NUMBER_STRINGS[k] + "," +NUMBER_STRINGS[l] + "] y = *" +NUMBER_STRINGS[y] + " ")
                     elif info == Info.INFLUENCERS:
                         if not compact:
-                            print("[" + str(k) + ":" +str(l) + "] =", end = " ")
-                        print("(" + str(y) + "*)", end = " ")
+                            write("[" + NUMBER_STRINGS[k] + ":" +NUMBER_STRINGS[l] + "] = ")
+                        write("(" + NUMBER_STRINGS[y] + "*) ")
                     elif info == Info.CANDIDATES:
                         if not compact:
-                            print("[" + str(k) + ":" +str(l) + "] =", end = " ")
-                        print("(" + str(y) + " *)", end = " ")
+                            write("[" + NUMBER_STRINGS[k] + ":" +NUMBER_STRINGS[l] + "] = ")
+                        write("(" + NUMBER_STRINGS[y] + " *) ")
                     else:
-                        print(" " + str(y) + " ",end = " ")
+                        write(" " + NUMBER_STRINGS[y] + "  ")
                 else:
                     if info == Info.ALL:
-                        print("[" + str(k) + "," +str(l) + "] z = " + str(z), end = " " )
-                        print(x,y,z);
+                        write("[" + NUMBER_STRINGS[k] + "," +NUMBER_STRINGS[l] + "] z = " + str(z) + " ")
+                        write(str(x) + " " + NUMBER_STRINGS[y] + " " + str(z) + "\n")
                     elif info == Info.INFLUENCERS:
                         if not compact:
-                            print("[" + str(k) + ":" +str(l) + "] =", end = " ")
-                        print(z, end = " ")
+                            write("[" + NUMBER_STRINGS[k] + ":" +NUMBER_STRINGS[l] + "] = ")
+                        write(str(z) + " ")
                     elif info == Info.CANDIDATES:
                         if not compact: 
-                            print("[" + str(k) + ":" +str(l) + "] =", end = " ")
-                        print(self.calcCandidates(z), end = " ")
+                            write("[" + NUMBER_STRINGS[k] + ":" +NUMBER_STRINGS[l] + "] = ")
+                        write(str(self.board.calcCandidates(z)) + " ")
                     else:
-                        print("   ",end= " ")
-            print()
-            print()
+                        write("    ")
+            write("\n")
+            write("\n")
+        sys.stdout.write("".join(out))
             
     # display just the quadrant
     def displayQuadrant(self, d1, d2, info = Info.ALL):
         if info == Info.NONE: return
+        out   = [] # output is collected and written at once
+        write = out.append
         for k in range(1,dim+1):
             for l in range(1,dim+1):
-                (x,y,z) = self.getElementInQuadrant_data(d1,d2,k,l)
+                (x,y,z) = self.board.getElementInQuadrant(d1,d2,k,l)
                 if x:
                     if info == Info.ALL:
-                        print("(" + str(k) + "," +str(l) + ")")
-                        print(x,y,z)
+                        write("(" + NUMBER_STRINGS[k] + "," +NUMBER_STRINGS[l] + ")\n")
+                        write(str(x) + " " + NUMBER_STRINGS[y] + " " + str(z) + "\n")
                     elif (info == Info.INFLUENCERS) or (info == Info.CANDIDATES):
-                        print("(" + str(y) + " *)", end = " ")
+                        write("(" + NUMBER_STRINGS[y] + " *) ")
                     else:
-                        print(y,end = " ")
+                        write(NUMBER_STRINGS[y] + " ")
                 else:
                     if info == Info.ALL:
-                        print(x,y,z);
+                        write(str(x) + " " + NUMBER_STRINGS[y] + " " + str(z) + "\n")
                     elif info == Info.INFLUENCERS:
-                        print(z, end = " ")
+                        write(str(z) + " ")
                     elif info == Info.CANDIDATES:
-                        print(self.calcCandidates(z), end = " ")
+                        write(str(self.board.calcCandidates(z)) + " ")
                     else:
-                        print(0,end= " ")
-            print()
+                        write("0 ")
+            write("\n")
+        sys.stdout.write("".join(out))
             
     # display a row
     def displayRow(self, row, info = Info.ALL):
         if info == Info.NONE: return
+        out   = [] # output is collected and written at once
+        write = out.append
         for c in range(1,DIM+1):
-            (x,y,z) = self.getElement(row, c)
+            (x,y,z) = self.board.getElement(row, c)
             if x:
                 if info == Info.ALL:
-                    print("(" + str(row) + "," +str(c) + ")")
-                    print(x,y,z)
+                    write("(" + NUMBER_STRINGS[row] + "," +NUMBER_STRINGS[c] + ")\n")
+                    write(str(x) + " " + NUMBER_STRINGS[y] + " " + str(z) + "\n")
                 elif (info == Info.INFLUENCERS) or (info == Info.CANDIDATES):
-                    print("(" + str(y) + " *)", end = " ")
+                    write("(" + NUMBER_STRINGS[y] + " *) ")
                 else:
-                    print(y,end = " ")
+                    write(NUMBER_STRINGS[y] + " ")
             else:
                 if info == Info.ALL:
-                    print("(" + str(row) + "," +str(c) + ")")
-                    print(x,y,z);
+                    write("(" + NUMBER_STRINGS[row] + "," +NUMBER_STRINGS[c] + ")\n")
+                    write(str(x) + " " + NUMBER_STRINGS[y] + " " + str(z) + "\n")
                 elif info == Info.INFLUENCERS:
-                    print(z, end = " ")
+                    write(str(z) + " ")
                 elif info == Info.CANDIDATES:
-                    print(self.calcCandidates(z), end = " ")
+                    write(str(self.board.calcCandidates(z)) + " ")
                 else:
-                    print(0,end= " ")
-        print()
+                    write("0 ")
+        write("\n")
+        sys.stdout.write("".join(out))
     
     # display a column        
     def displayColumn(self, col, info = Info.ALL):
         if info == Info.NONE: return
+        out   = [] # output is collected and written at once
+        write = out.append
         for r in range(1,DIM+1):
-            (x,y,z) = self.getElement(r, col)
+            (x,y,z) = self.board.getElement(r, col)
             if x:
                 if info == Info.ALL:
-                    print("(" + str(r) + "," +str(col) + ")")
-                    print(x,y,z)
+                    write("(" + NUMBER_STRINGS[r] + "," +NUMBER_STRINGS[col] + ")\n")
+                    write(str(x) + " " + NUMBER_STRINGS[y] + " " + str(z) + "\n")
                 elif (info == Info.INFLUENCERS) or (info == Info.CANDIDATES):
-                    print("(" + str(y) + " *)")
+                    write("(" + NUMBER_STRINGS[y] + " *)\n")
                 else:
-                    print(y)
+                    write(NUMBER_STRINGS[y] + "\n")
             else:
                 if info == Info.ALL:
-                    print("(" + str(r) + "," +str(col) + ")")
-                    print(x,y,z);
+                    write("(" + NUMBER_STRINGS[r] + "," +NUMBER_STRINGS[col] + ")\n")
+                    write(str(x) + " " + NUMBER_STRINGS[y] + " " + str(z) + "\n")
                 elif info == Info.INFLUENCERS:
-                    print(z)
+                    write(str(z) + "\n")
                 elif info == Info.CANDIDATES:
-                    print(self.calcCandidates(z))
+                    write(str(self.board.calcCandidates(z)) + "\n")
                 else:
-                    print(0)
-        print()
+                    write("0\n")
+        write("\n")
+        sys.stdout.write("".join(out))
         
     ############# prettyPrint methods ############## 
     
-    # using convertToIntArray _data[] is converted
-    # to a two dimensional array of ints.
+    # using convertToIntArray the occupants of the board
+    # are converted to a two dimensional array of ints.
     # this array can be printed using prettyPrint()
     def convertToIntArray(self):
-        intarray = []
-        for i in range(1, DIM+1):
-            row = []
-            for j in range(1, DIM+1):
-                row.append(self.board.getOccupant(i,j))
-            # add row to intarray
-            intarray.append(row)
-        return intarray
+        value = self.board.value # one slice per row
+        return [list(value[row * DIM:(row+1) * DIM]) for row in range(0, DIM)]
         
     # prettyPrint displays the Sudoku board in a textual
     # but nice way
@@ -474,11 +513,14 @@ class SudokuSolver:
         line2  = createLine("╟───┼───╫───╢")
         line3  = createLine("╠═══╪═══╬═══╣")
         line4  = createLine("╚═══╧═══╩═══╝")
+        out    = [] # output is collected and written at once
+        write  = out.append
 
-        print(line0)
+        write(line0 + "\n")
         for r in range(1,DIM+1):
-            print( "".join(n+s for n,s in zip(nums[r-1],line1.split("."))) )
-            print([line2,line3,line4][(r % DIM==0)+(r % dim==0)])
+            write("".join(n+s for n,s in zip(nums[r-1],line1.split("."))) + "\n")
+            write([line2,line3,line4][(r % DIM==0)+(r % dim==0)] + "\n")
+        sys.stdout.write("".join(out))
     
     # method to print board with candidates or influencers perspective
     # it uses the method getElement(i,j) zo access individual cells:        
@@ -518,9 +560,11 @@ class SudokuSolver:
         
         # body of printCandidatesAndInfluencers():
     
+        out   = [] # output is collected and written at once
+        write = out.append
         if title != "": 
-            print("                               " + title)
-        print("----------------------------------------------------------------------------------")
+            write("                               " + title + "\n")
+        write("----------------------------------------------------------------------------------\n")
         for r in range(1, DIM+1):
             line1 = "| " 
             line2 = "| "
@@ -529,15 +573,16 @@ class SudokuSolver:
                 cell = []
                 number = 0
                 # get Element at (r,c)
-                (x,y,z) = self.board.getElement(r,c)
+                y = self.board.getOccupant(r,c)
+                x = y != 0 # occupied cell
                 if not x: # unoccupied cell
                     # the unoccupied cell is instantiated with 
                     # candidates (if candidates == True) or 
                     # with influencers
                     if not candidates: # influencers are needed
-                        cell = z
+                        cell = numbersInMask(self.board.getMask(r,c))
                     else:  # candidates are needed
-                        cell = self.board.calcCandidates(z)
+                        cell = candidatesOfMask(self.board.getMask(r,c))
                     size = len(cell) # measure length of cell
                 else: # occupied cell
                     number = y # get occupant
@@ -562,20 +607,21 @@ class SudokuSolver:
                     line2 += " | "
                     line3 += " | "
    
-            print(line1)
-            print(line2)
-            print(line3)
+            write(line1 + "\n")
+            write(line2 + "\n")
+            write(line3 + "\n")
             # print border of current row
             if r % 3 == 0:
-                print("----------------------------------------------------------------------------------")
+                write("----------------------------------------------------------------------------------\n")
                 # print()
             else:
-                print()
-        print("Legend: '* number *' specifies the occupant of a cell.")
-        print()
-        print("        ' 1 2 3 '")
-        print("        ' 4 5 6 '    specify the influencers or candidates.")
-        print("        ' 7     '")
+                write("\n")
+        write("Legend: '* number *' specifies the occupant of a cell.\n")
+        write("\n")
+        write("        ' 1 2 3 '\n")
+        write("        ' 4 5 6 '    specify the influencers or candidates.\n")
+        write("        ' 7     '\n")
+        sys.stdout.write("".join(out))
             
     
     ############# solver methods ############# 
@@ -583,62 +629,61 @@ class SudokuSolver:
     # checks whether all cells are occupied 
     # can also checked with vacancies == [] instead
     def isCompleted(self):
-        for idx in range(0, DIM*DIM):
-            (x,y,z) = self.board._data[idx]
-            if not x:
-                return False
-        return True
+        return self.board.vacancyCount == 0
     
     bfs = "" # used to cache results of solveBF()-invocations 
                 
     # make sure that cells contain '0', '1', ... , 'DIM'
     def wellFormed(self, string):
-        for idx in range(0, DIM*DIM):
-            if string[idx] in {'0', '1', '2', '3', '4', '5', '6', '7', '8', '9'}:   
-                continue
-            else:
-                return False
-        return True           
+        return set(string[0:DIM*DIM]) <= DIGIT_CHARS
                 
     # Brute Force Algorithm
     # solveBF gets a one-dimensional string as input (with the 
     # digits "0".."9" as characters). "0" represents an empty
     # cell. The actual work is done in solveBruteForce().
     # It returns the result of the brute force calculation to 
-    # the caller
+    # the caller, or "" if there is no solution.
+    # The numbers used in each row, column, and quadrant are kept 
+    # as bitmasks (bit n-1 stands for n), so placing or removing
+    # a number only changes three integers
     def solveBF(self, string):
-        def solveBruteForce(string):
-            # all numbers in same row, column or quadrant define
-            # numbers that can not be in a cell. influencer determines
-            # if content at index i and index j influence each
-            # other
-            def influencer(i,j):
-                return (i//DIM == j//DIM) or (i%DIM == j%DIM) or  (((i//DIM)//dim == (j//DIM)//dim) and ((i%DIM)//dim == (j%DIM)//dim))
-        
-            # find the first vacant cell. Vacant cells contain '0'
-            vacancy = string.find('0')
-        
-            # which numbers are not allowed because of other
-            # cells in the neighborhood
-            influencers = {string[j] for j in range(len(string)) if influencer(vacancy, j)}
-            # all possible digits ("1", "2", ...., DIM):
-            all = {str(num) for num in range(1, DIM+1)}
-            
-            # subtract the numbers that can't occupy the cell
-            candidates = all - influencers
-
+        def solveBruteForce():
+            if not vacancies:
+                return True # no vacant cells left => we are done
+            # take the vacant cell with the fewest candidates. 
+            # A cell without any candidates ends the search at once
+            top = len(vacancies) - 1
+            best, fewest = top, DIM+1
+            for k in range(top, -1, -1):
+                (row, col, quadrant) = UNITS[vacancies[k]]
+                count = (~(rowUsed[row] | colUsed[col] | quadUsed[quadrant]) & ALL_NUMBERS_MASK).bit_count()
+                if count < fewest:
+                    best, fewest = k, count
+                    if count <= 1: break # cannot get any better
+            vacancies[best], vacancies[top] = vacancies[top], vacancies[best]
+            vacancy = vacancies.pop()
+            (row, col, quadrant) = UNITS[vacancy]
+            # numbers not used in the neighborhood are candidates
+            candidates = ~(rowUsed[row] | colUsed[col] | quadUsed[quadrant]) & ALL_NUMBERS_MASK
             # iterate through all candidates
-            for num in candidates:
-                # build a new string with the analyzed cell occupied
-                # by num 
-                string = string[0:vacancy] + num + string[vacancy+1:]
-                # and call solveBruteForce with the modified 
-                # string recursively
-                solveBruteForce(string) # ignore results
-                # if the resulting string comprises no vacant cells,  
-                # we are done
-                if string.find('0') == -1:
-                    self.bfs = string # store result in bfs
+            while candidates:
+                bit = candidates & -candidates # lowest candidate
+                candidates ^= bit
+                # occupy the cell with the candidate
+                cells[vacancy] = bit.bit_length()
+                rowUsed[row]       |= bit
+                colUsed[col]       |= bit
+                quadUsed[quadrant] |= bit
+                # and continue recursively 
+                if solveBruteForce():
+                    return True
+                # undo the occupation
+                rowUsed[row]       ^= bit
+                colUsed[col]       ^= bit
+                quadUsed[quadrant] ^= bit
+            cells[vacancy] = 0
+            vacancies.append(vacancy) # cell is vacant again
+            return False
         
         if len(string) != DIM*DIM:
             print("Error length is not " + str(DIM*DIM))
@@ -646,11 +691,143 @@ class SudokuSolver:
         if not self.wellFormed(string):
             print("Error: string contains invalid characters")
             return ""
-       
-        solveBruteForce(string) # delegate to solveBruteForce()
+        
+        cells    = bytearray(int(ch) for ch in string)
+        rowUsed  = [0] * DIM
+        colUsed  = [0] * DIM
+        quadUsed = [0] * DIM
+        for idx in range(0, DIM*DIM):
+            if cells[idx] == 0: continue
+            (row, col, quadrant) = UNITS[idx]
+            bit = 1 << (cells[idx]-1)
+            if (rowUsed[row] | colUsed[col] | quadUsed[quadrant]) & bit:
+                self.bfs = "" # number appears twice => no solution
+                return self.bfs
+            rowUsed[row]       |= bit
+            colUsed[col]       |= bit
+            quadUsed[quadrant] |= bit
+        # stack of vacant cells (vacant cells contain 0), 
+        # the first vacant cell on top
+        vacancies = [idx for idx in range(DIM*DIM-1, -1, -1) if cells[idx] == 0]
+        
+        if solveBruteForce(): # delegate to solveBruteForce()
+            self.bfs = "".join([str(num) for num in cells]) # store result in bfs
+        else:
+            self.bfs = ""
         return self.bfs # return result to caller
         # bfs stands for brute force solution
                 
+    ############# interactive commands ############# 
+    
+    # solve() calls these handlers when the user enters a command 
+    # between two steps. Each handler gets the current display 
+    # mode and returns the display mode to continue with, or None
+    # if solving should stop
+    def commandQuit(self, info):
+        print("Exiting from SudokuSolver ...")
+        return None
+        
+    def commandPersist(self, info):
+        print("Saving state to Persistence")
+        while True:
+            name = input(" Specify name ---> ")
+            if name != "" and not name in StatePersistence().keys():
+                StatePersistence().persistState(name, self.board._data)
+                break
+        return info
+        
+    def commandWrite(self, info):
+        repeat = 0
+        rows = self.board.turnBoardIntoList()
+        while True and repeat < 3:
+            fname = input("* Enter name of output file: ")   
+            if len(fname) == 0:
+                print("  Error: Incorrect file name")
+                repeat += 1
+                continue
+            try:
+                self.board.writeSudokuToCSV(fname, rows)    
+            except FileExistsError:
+                print("  Error - file already exists. Use another filename.")
+                continue
+            print("Output File " + fname + " written !")
+            break
+        if repeat == 3:
+            print("Action stopped")
+        input("press any key to continue ")                       
+        return info
+        
+    def commandHelp(self, info):
+        print("""
+        ***** Help *****
+        press     h for help
+                  s for shuffling strategies
+                  n for noninteractive mode
+                  a for activating Monitoring
+                  d for deactivating Monitoring
+                  p to  persist state in stack
+                  w to  write Sudoku puzzle to a file
+                  i to  inspect the current board w.r.t. influencers
+                  c to  inspect the current board w.r.t. candidates
+                  q to  quit this loop
+                                    """)
+        input("press any key to continue ")
+        return info
+        
+    def commandActivateMonitoring(self, info):
+        self.monitoringActive = True
+        print("Monitoring activated")
+        return info
+        
+    def commandDeactivateMonitoring(self, info):
+        self.monitoringActive = False
+        print("Monitoring deactivated")
+        return info
+        
+    def commandInfluencers(self, info):
+        self.printCandidatesAndInfluencers(candidates = False, title="LIST OF INFLUENCERS")
+        return info
+        
+    def commandCandidates(self, info):
+        self.printCandidatesAndInfluencers(candidates = True, title="LIST OF CANDIDATES")
+        return info
+        
+    def commandShuffle(self, info):
+        print("Shuffling all strategies ...")
+        shuffle(self.occupationStrategies)
+        shuffle(self.influenceStrategies)
+        return info
+        
+    def commandNoninteractive(self, info):
+        print("Enabling noninteractive mode ...")
+        return Info.NONE
+        
+    def commandUnknown(self, info):
+        print("press q or any other key to quit")
+        return info
+        
+    # handlers of the commands available when solve() is stuck.
+    # They return True if solve() should stop asking for commands
+    def commandStuckQuit(self):
+        return True
+        
+    def commandStuckWrite(self):
+        rows = self.board.turnBoardIntoList()
+        while True:
+            fname = input("* Enter name of output file: ")   
+            if len(fname) == 0:
+                print("  Error: Incorrect file name")
+                continue
+            try:
+                self.board.writeSudokuToCSV(fname, rows)    
+            except FileExistsError:
+                print("  Error - file already exists. Use another filename.")
+                continue
+            print("Output File " + fname + " written !")
+            break
+        input("press any key to continue ")
+        return True
+        
     # while Sudoku is not solved,
     # loop through all cells of the board 
     # and find all cells that can be occupied.
@@ -697,81 +874,28 @@ class SudokuSolver:
                             print("(SudokuSolver): Enter <any key> to continue, q to quit, <cmd> for another command, h to display help about commands")
                             value = input(" ---> ")
                             print()
-                            match value:
-                                case "q": 
-                                    print("Exiting from SudokuSolver ...")
-                                    return True # True because user aborts
-                                case "p":
-                                    print("Saving state to Persistence")
-                                    while True:
-                                        name = input(" Specify name ---> ")
-                                        if name != "" and not name in StatePersistence().keys():
-                                            StatePersistence().persistState(name, self.board._data)
-                                            break
-                                case "w":
-                                    repeat = 0
-                                    rows = self.board.turnBoardIntoList()
-                                    while True and repeat < 3:
-                                        fname = input("* Enter name of output file: ")   
-                                        if os.path.isfile(fname):
-                                            print("  Error - file already exists. Use another filename.")
-                                        elif len(fname) == 0:
-                                            print("  Error: Incorrect file name")
-                                            repeat += 1
-                                        else:
-                                            self.board.writeSudokuToCSV(fname, rows)    
-                                            print("Output File " + fname + " written !")
-                                            break
-                                    if repeat == 3:
-                                        print("Action stopped")
-                                    input("press any key to continue ")                       
-                                case "h":
-                                    print("""
-        ***** Help *****
-        press     h for help
-                  s for shuffling strategies
-                  n for noninteractive mode
-                  a for activating Monitoring
-                  d for deactivating Monitoring
-                  p to  persist state in stack
-                  w to  write Sudoku puzzle to a file
-                  i to  inspect the current board w.r.t. influencers
-                  c to  inspect the current board w.r.t. candidates
-                  q to  quit this loop
-                                    """)
-                                    input("press any key to continue ")
-                                case "a": 
-                                    self.monitoringActive = True
-                                    print("Monitoring activated")
-                                case "d":
-                                    self.monitoringActive = False
-                                    print("Monitoring deactivated")
-                                case "i":
-                                    self.printCandidatesAndInfluencers(candidates = False, title="LIST OF INFLUENCERS")
-                                case "c":
-                                    self.printCandidatesAndInfluencers(candidates = True, title="LIST OF CANDIDATES")
-                                    #input("press any key to continue ")
-                                case "s":
-                                    print("Shuffling all strategies ...")
-                                    shuffle(self.occupationStrategies)
-                                    shuffle(self.influenceStrategies)
-                                case "n":
-                                    print("Enabling noninteractive mode ...")
-                                    info = Info.NONE
-                                case other: 
-                                    print("press q or any other key to quit")
+                            # dispatch to the handler of the command
+                            command = self.commands.get(value, self.commandUnknown)
+                            info = command(info)
+                            if info == None: 
+                                return True # True because user aborts
                             print()
 
                         self.occupy(n, i, j) # occupy it
                         self.steps += 1 # increase step counter
                         changes += 1 # increase change counter
 
-                        if (info == Info.PRETTY) or (info == Info.NONE):
+                        # Info.NONE => no board output between steps
+                        if info == Info.NONE: continue
+                        if info == Info.PRETTY:
                             self.prettyPrint(self.convertToIntArray())
                         else:
                             self.displayBoard(info) # display board
                         print("STEP: " + str(self.steps)) # display step
                         print()
+            # no changes => try the deferred strategies before giving up
+            if changes == 0 and self.applyAllInfluenceStrategies():
+                continue
             if changes == 0: # no changes => cannot solve board any further 
                     print("I am stuck: cannot solve remaining cells with existing strategies.")
                     print("Candidates Listing for manual analysis:")
@@ -780,25 +904,11 @@ class SudokuSolver:
                     print("(sudokuSolver): Enter w to write state to file, q to quit ")
                     while not ready:
                         value = input(" ---> ")
-                        match value:
-                            case 'q': 
-                                ready = True
-                            case 'w':
-                                rows = self.board.turnBoardIntoList()
-                                while True:
-                                    fname = input("* Enter name of output file: ")   
-                                    if os.path.isfile(fname):
-                                        print("  Error - file already exists. Use another filename.")
-                                        continue
-                                    elif len(fname) == 0:
-                                        print("  Error: Incorrect file name")
-                                        continue
-                                    else:
-                                        self.board.writeSudokuToCSV(fname, rows)    
-                                        print("Output File " + fname + " written !")
-                                        ready = True
-                                        break
-                                input("press any key to continue ")
+                        # dispatch to the handler of the command,
+                        # other input is ignored
+                        command = self.stuckCommands.get(value)
+                        if command != None:
+                            ready = command()
                     return False
         if (self.isCompleted()): # successful completion of loop
             print("Success: board solved")
@@ -35,12 +35,18 @@ InfluenceStrategy
 #############################################################
 """
 
+from board import DIM, dim, NUMBERS
+
 
 class OccupationStrategy:
+    # strategies only carry the attributes listed here.
+    # Derived classes declare their own (usually empty) __slots__
+    __slots__ = ('board',)
+    
     # constructor expects Board instance on which
     # the strategy instance is supposed to operate
     def __init__(self, board):
-        pass
+        self.board = board
         
     # apply strategy to quadrant, row, and column
     # defined by (i,j). As soon as strategy returns
@@ -74,9 +80,61 @@ class OccupationStrategy:
     
 ############# Base class for all influence strategies ############ 
 class InfluenceStrategy:
+    # strategies only carry the attributes listed here.
+    # Derived classes declare their own (usually empty) __slots__
+    __slots__ = ('board', 'previousVersion', 'currentVersion', 'previousLines')
+    
+    # deferred strategies are expensive. SudokuSolver does not 
+    # apply them after each occupation, but only when it cannot
+    # find any further cell to occupy
+    deferred = False
+    
     def __init__(self, board):
-        pass
+        self.board = board
+        # board.version seen by the previous and the current run
+        # of the strategy
+        self.previousVersion = -1
+        self.currentVersion  = -1
+        # candidate lines seen by the previous run, see changedPivots()
+        self.previousLines   = None
+        
     def applyStrategy(self):
         self.applyStrategyToRows()
-        self.applystrategyToColumns()
-        self.applyStrategyToQuadrants()
\ No newline at end of file
+        self.applyStrategyToColumns()
+        self.applyStrategyToQuadrants()
+        
+    # to be called at the beginning of applyStrategy(). Everything 
+    # that changes afterwards (including the changes made by this 
+    # run) is revisited in the next run. Returns False if the 
+    # board did not change at all since the previous run
+    def startRun(self):
+        self.previousVersion = self.currentVersion
+        self.currentVersion  = self.board.version
+        return self.currentVersion != self.previousVersion
+        
+    # rows, columns and quadrants that have changed since 
+    # the previous run of the strategy
+    def changedRows(self):
+        return [r for r in NUMBERS if self.board.rowStamps[r-1] > self.previousVersion]
+        
+    def changedColumns(self):
+        return [c for c in NUMBERS if self.board.columnStamps[c-1] > self.previousVersion]
+        
+    def changedQuadrants(self):
+        return [(d1, d2) for d1 in range(1, dim+1) for d2 in range(1, dim+1) 
+                if self.board.quadrantStamps[(d1-1)*dim + d2-1] > self.previousVersion]
+        
+    # strategies working on the candidate lines of the whole board
+    # (see Board.getCandidateLines) only need to revisit the pivots
+    # whose lines differ from those seen by the previous run
+    def changedPivots(self, lines):
+        previous = self.previousLines
+        if previous is None: return list(NUMBERS)
+        return [pivot for pivot in NUMBERS if lines[pivot] != previous[pivot]]
+        
+    # remember the lines analyzed by this run for changedPivots(). 
+    # Pivots in revisit led to eliminations. They are always 
+    # analyzed again, as the board might be restored to the 
+    # lines seen by this run
+    def rememberLines(self, lines, revisit):
+        self.previousLines = [None if pivot in revisit else lines[pivot] for pivot in range(0, DIM+1)]
@@ -21,99 +21,72 @@ This package consist of the classes
 """
 ############ Swordfish Strategy ################ 
 
-from board import Board, dim, DIM
+from board import Board, dim, NUMBERS, numbersInMask
 from strategy import InfluenceStrategy
 
-class SwordFishStrategy(InfluenceStrategy):
-    def __init__(self, board):
-        self.board = board
-    
-    # check how often the pivot appears in the row
-    def rowContainsCandidate(self, pivot, r):
-        result = 0
-        # search in all columns
-        for c in range(1, DIM+1):
-            (x,y,z) = self.board.getElement(r,c)
-            if x: continue # continue when occupied
-            if pivot in self.board.getCandidates(r,c):
-                result += 1
-        return result
-
-    # check how often the pivot appears in the column
-    def columnContainsCandidate(self, pivot, c):
-        # search in all rows
-        for r in range(1, DIM+1):
-            result = 0
-            (x,y,z) = self.board.getElement(r,c)
-            if x: continue # continue when occupied
-            if pivot in self.board.getCandidates(r,c):
-                result += 1
-        return result
+# kernel of SwordFishStrategy working on plain bitmasks:
+# lines[pivot][l] contains the cells of line l (row or column)
+# which have pivot as a candidate. For all configurations of 
+# 3 lines where the pivot is found 2 or 3 times as a candidate, 
+# it is checked whether these cells lie on only three crossing
+# lines. Only the numbers in pivots are analyzed. Returns a list
+# of (pivot, [l1, l2, l3], mask) where mask defines the three 
+# crossing lines
+def scanForSwordfish(lines, pivots):
+    swordfish = []
+    for pivot in pivots:
+        masks = lines[pivot]
+        # only lines with 2 or 3 cells containing pivot qualify,
+        # each count is computed once per pivot
+        qualified = [l for l in NUMBERS if 1 < masks[l].bit_count() <= dim]
+        if len(qualified) < 3: continue # no Swordfish possible for this pivot
+        for (k1, l1) in enumerate(qualified):
+            for (k2, l2) in enumerate(qualified[k1+1:], k1+1):
+                mask12 = masks[l1] | masks[l2]
+                # two lines covering more than 3 crossing lines
+                # cannot be part of a Swordfish
+                if mask12.bit_count() > dim: continue
+                # the third line is taken from the lines following l2
+                for l3 in qualified[k2+1:]:
+                    mask = mask12 | masks[l3]
+                    if mask.bit_count() == dim:
+                        swordfish.append((pivot, [l1, l2, l3], mask))
+    return swordfish
 
-    # checks for the three columns specified 
-    # in which rows the pivot can be found
-    def matchingRows(self, pivot, c1, c2, c3):
-        rowList = []
-        # search in all rows where pivot is a candidate 
-        for r in range(1,DIM+1):
-            if (pivot in self.board.getCandidates(r, c1)) or (pivot in self.board.getCandidates(r, c2)) or (pivot in self.board.getCandidates(r, c3)):
-                rowList.append(r)
-        return rowList
 
-    # checks for the three rows specified 
-    # in which columns the pivot can be found
-    def matchingColumns(self, pivot, r1, r2, r3):
-        colList = []
-        # search in all columns where pivot is a candidate 
-        for c in range(1,DIM+1):
-            if (pivot in self.board.getCandidates(r1, c)) or (pivot in self.board.getCandidates(r2, c)) or (pivot in self.board.getCandidates(r3, c)):
-                colList.append(c)
-        return colList
+class SwordFishStrategy(InfluenceStrategy):
+    __slots__ = ()
+    deferred = True # searches the whole board for every pivot
+    
+    def __init__(self, board):
+        super().__init__(board)
 
-    # for all pivots and all configurations of 3 columns where
-    # the pivot is found 2 or 3 times as a candidate, it is checked
-    # whether there are only three rows in which the pivot is a 
-    # candidate. If yes, SwordFisgh can be applied by removing
-    # the candidates from these rows which are not in one of 
-    # the columns
-    def applyStrategyToColumns(self):
-        for pivot in range(1, DIM+1):
-            for c1 in range(1, DIM-1):
-                howMany = self.columnContainsCandidate(pivot, c1)
-                if howMany <= 1 or howMany > dim: continue
-                for c2 in range(c1+1, DIM):
-                    howMany = self.columnContainsCandidate(pivot, c2)
-                    if howMany <= 1 or howMany > dim: continue
-                    for c3 in range(c2+1, DIM+1):
-                        howMany = self.columnContainsCandidate(pivot, c3)
-                        if howMany <= 1 or howMany > dim: continue
-                        rowList = self.matchingRows(pivot,c1,c2,c3)
-                        if len(rowList) == dim:
-                            for r in rowList:
-                                self.board.addInfluencerToRow(pivot, r, [c1, c2, c3])
+    # a Swordfish defined by three lines allows to remove the 
+    # pivot from the crossing lines except in these lines. lines
+    # are the columns if byColumns is True, the rows otherwise. 
+    # Both directions share this code, as they only differ in 
+    # the order of the coordinates
+    def applyStrategyToLines(self, lines, pivots, byColumns):
+        found = [] # pivots leading to eliminations
+        for (pivot, lineList, mask) in scanForSwordfish(lines, pivots):
+            # all crossing lines are handled in one batch
+            cells = [(cross, l) if byColumns else (l, cross) 
+                     for cross in numbersInMask(mask) for l in NUMBERS if not l in lineList]
+            if self.board.addInfluencersBulk(1 << (pivot-1), cells):
+                found.append(pivot)
+        return found
+        
+    def applyStrategyToColumns(self, columns, pivots):
+        return self.applyStrategyToLines(columns, pivots, True)
 
-    # for all pivots and all configurations of 3 rows where
-    # the pivot is found 2 or 3 times as a candidate, it is checked
-    # whether there are only three columns in which the pivot is a 
-    # candidate. If yes, SwordFisgh can be applied by removing
-    # the candidates from these columns which are not in one of 
-    # the rows
-    def applyStrategyToRows(self):
-        for pivot in range(1, DIM+1):
-            for r1 in range(1, DIM-1):
-                howMany = self.rowContainsCandidate(pivot, r1)
-                if howMany <= 1 or howMany > dim: continue
-                for r2 in range(r1+1, DIM):
-                    howMany = self.rowContainsCandidate(pivot, r2)
-                    if howMany <= 1 or howMany > dim: continue
-                    for r3 in range(r2+1, DIM+1):
-                        howMany = self.rowContainsCandidate(pivot, r3)
-                        if howMany <= 1 or howMany > dim: continue
-                        colList = self.matchingColumns(pivot,r1,r2,r3)
-                        if len(colList) == dim:
-                            for c in colList:
-                                self.board.addInfluencerToColumn(pivot, c, [r1, r2, r3])
+    def applyStrategyToRows(self, rows, pivots):
+        return self.applyStrategyToLines(rows, pivots, False)
 
     def applyStrategy(self):
-        self.applyStrategyToColumns()
-        self.applyStrategyToRows()
\ No newline at end of file
+        if not self.startRun(): return # board did not change
+        (rows, columns) = self.board.getCandidateLines()
+        # columns is the transposed view of rows
+        pivots = self.changedPivots(rows)
+        found  = self.applyStrategyToColumns(columns, pivots)
+        found += self.applyStrategyToRows(rows, pivots)
+        self.rememberLines(rows, found)
@@ -25,117 +25,42 @@ Note that this functionality is currently very expermimental.
 #############################################################
 """
 
-# Token values: helper class for CellAssignmentParser
-
-from enum import Enum, unique
+import re
 from solver import SudokuSolver, DIM, dim, Info
-from copy import deepcopy
-
-@unique
-class Tokens(Enum):
-    OPAREN = 10 # = [
-    CPAREN = 11 # = ]
-    ASSIGN = 12 # = =
-    ERROR  = 13 
-    EOF    = 14
-    SEP    = 15 # = ,
     
     
 class SudokuWhatIf:
+    # instead of copying the whole solver each scenario only 
+    # takes a snapshot of its board as the start context to go 
+    # back to (see runScenario). The solver itself is only read
     def __init__(self, solver):
-        self.solver = deepcopy(solver)
+        self.solver = solver
         
     # parser for checking cell assigments the user types in such as [7, 9] = 6
+    # The format is simple enough to be matched by a single regular
+    # expression which is compiled once. Round brackets may be used
+    # instead of square brackets
     class CellAssignmentParser:
+        PATTERN = re.compile(r'^\s*[\[(]\s*([1-9])\s*,\s*([1-9])\s*[\])]\s*=\s*([1-9])\s*$')
+        
         def __init__(self, string):
             self.string = string
-            self.pos = 0
-
-        def getNextToken(self): # the lexer
-            if self.pos >= len(self.string):
-                print("Error: unexpected EOF")
-                return Tokens.EOF
-            while self.string[self.pos] == " " and self.pos < len(self.string)-1: 
-                self.pos += 1
-                continue 
-            if self.string[self.pos] == '[': 
-                self.pos += 1
-                return Tokens.OPAREN
-            elif self.string[self.pos] == "(": 
-                self.pos += 1
-                return Tokens.OPAREN
-            elif self.string[self.pos] in ["1", "2", "3", "4", "5", "6", "7", "8", "9"]:
-                self.pos += 1
-                return int(self.string[self.pos-1])
-            elif self.string[self.pos] == "]":
-                self.pos += 1                 
-                return Tokens.CPAREN
-            elif self.string[self.pos] == ")": 
-                self.pos += 1
-                return Tokens.CPAREN
-            elif self.string[self.pos] == ',': 
-                self.pos+= 1
-                return Tokens.SEP
-            elif self.string[self.pos] == "=": 
-                self.pos += 1
-                return Tokens.ASSIGN
-            elif self.string[self.pos] == "\n":
-                return Tokens.EOF
-            else: return Tokens.ERROR
 
-        def parse(self): # recursive descent parser for user input
-            num1 = 0
-            num2 = 0
-            num3 = 0
-            # parse for [
-            token = self.getNextToken()
-            if token != Tokens.OPAREN:
-                print("Error: [ or ( expected in pos " + str(1+self.pos))
-                return None
-            # parse for number in [1..9]
-            token = self.getNextToken()
-            if not token in range(1,10):
-                print("Error: number in [1..9] expected in pos " + str(1+self.pos))
-                return None
-            else:
-                num1 = token # row of cell
-            # parse for ,
-            token = self.getNextToken()
-            if not token == Tokens.SEP:
-                print("Error: , expected in pos " + str(1+self.pos))
+        def parse(self): # parser for user input
+            match = self.PATTERN.match(self.string)
+            if match is None:
+                print("Error: input must look like [r,c] = number with r, c, number in [1..9]")
                 return None
-            # parse for number in [1..9]
-            token = self.getNextToken()
-            if not token in range(1,10):
-                print("Error: number in [1..9] expected in pos " + str(1+self.pos))
-                return None
-            else:
-                num2 = token # col of cell
-            # parse for ]
-            token = self.getNextToken()
-            if token != Tokens.CPAREN:
-                print("Error: ] or ) expected in pos " + str(1+self.pos))
-                return None
-            # parse for =
-            token = self.getNextToken()
-            if not token == Tokens.ASSIGN:
-                print("Error: = expected in pos " + str(1+self.pos))
-                return None
-            # parse for number in [1..9]
-            token = self.getNextToken()
-            if not token in range(1,10):
-                print("Error: number in [1..9] expected in pos " + str(1+self.pos))
-                return None
-            else:
-                num3 = token # value assigned to cell
-                return (num1, num2, num3) # reflecting the input "[num1, num2] = num3""
+            # reflecting the input "[num1, num2] = num3"
+            (num1, num2, num3) = match.groups()
+            return (int(num1), int(num2), int(num3)) 
 
     # run a what-if scenario
     def runScenario(self):
-        self.board = deepcopy(self.solver.board)
+        # the board as it is now is the start context of the scenario
+        startContext = self.solver.board.snapshot()
         # create a new scenarioSolver with an existing solver as input
         scenarioSolver = SudokuSolver(withCheating = False, withMonitoring = True)
-        self.solver.board = self.board
         for row in range(1, DIM+1):
             for col in range(1, DIM+1):
                 (x,y,z) = self.solver.board.getElement(row, col)
@@ -158,7 +83,7 @@ class SudokuWhatIf:
                 if result != None: correct = True
             # check if cell is occupied
             isVacant = not scenarioSolver.isOccupied(result[0], result[1])
-            containsCandidate = result[2] in scenarioSolver.board.getCandidates(result[0], result[1])
+            containsCandidate = scenarioSolver.board.cellContainsCandidate((result[0], result[1]), result[2])
             if isVacant and containsCandidate:
                 scenarioSolver.occupy(result[2], result[0], result[1])
                 ready = True
@@ -166,7 +91,7 @@ class SudokuWhatIf:
                 if scenarioSolver.board.checkConformanceOfBoard() == False:
                     print("(SudokuWhatIf): Warning: this leads to an invalid board configuration.")
                     print("(SudokuWhatIf): Going back to start context.")
-                    scenarioSolver = deepcopy(self.solver)
+                    scenarioSolver.board.restore(startContext)
                     ready = False       
             else:
                 if not isVacant: